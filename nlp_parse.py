@@ -0,0 +1,196 @@
+"""
+MemoryPing v4.0 - Natural Language Parsing
+Created by Achu Vijayakumar
+
+Splits a reminder message into task, time phrase and metadata, and turns
+time phrases into clock-independent specs. Pure string and regex code with
+no bot state, so it can be compiled in place with mypyc (`mypyc nlp_parse.py`);
+the extension module then shadows this file on import.
+"""
+
+import re
+from datetime import timedelta
+from functools import lru_cache
+from typing import Container, Dict, List, NamedTuple, Optional
+
+# ============================================================================
+# PATTERNS
+# ============================================================================
+
+# Patterns are compiled once at import instead of looked up on every message
+RELATIVE_PATTERN = re.compile(r'(?:in|after)\s+(?:(\d+)\s*(?:hours?|hrs?|h))?\s*(?:(\d+)\s*(?:minutes?|mins?|min|m))?')
+CLOCK_12H_PATTERN = re.compile(r'(?:at\s+)?(\d{1,2})(?::(\d{2}))?\s*(am|pm)')
+CLOCK_24H_PATTERN = re.compile(r'at\s+(\d{1,2}):(\d{2})(?!\s*[ap]m)')
+# Only tried at the start of a whitespace run; retrying inside the run makes long
+# runs of spaces quadratic, and the run's start already covers every match
+TIME_KEYWORD_PATTERN = re.compile(r'(?<!\s)\s+(?:at|in|after)\s+')
+DAYPART_PATTERN = re.compile(r'lunch|dinner|morning|evening')
+TOMORROW_PATTERN = re.compile(r'tomorrow')
+
+# Keyword -> (hour, whether "tomorrow" pushes it a day even if it's still ahead today)
+DAYPART_HOURS = {
+    'lunch': (13, False),
+    'dinner': (19, False),
+    'morning': (9, True),
+    'evening': (18, True)
+}
+
+# Common trigger phrases, as one alternation so the text is scanned once
+TRIGGER_PATTERN = re.compile(
+    r'remind\s+me\s+to\s+'
+    r'|send\s+me\s+(?:a\s+)?'
+    r'|tell\s+me\s+(?:to\s+)?'
+    r'|ping\s+me\s+(?:about\s+|to\s+)?'
+    r'|alert\s+me\s+(?:about\s+|to\s+)?'
+)
+
+# Metadata tokens, cut out of the message in a single left-to-right pass
+METADATA_PATTERN = re.compile(
+    r'#(?P<cat>\w+)'
+    r'|!(?P<pri>(?i:high|medium|low))'
+    r'|--\s*(?P<note>.+?)(?=\s+[#!]|$)'
+    r'|@(?P<share>\w+)'
+)
+RECURRING_PATTERN = re.compile(
+    r'every day|daily|every week|weekly'
+    r'|every\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)'
+)
+DAILY_PHRASES = frozenset(('every day', 'daily'))
+
+# ============================================================================
+# TIME PHRASES
+# ============================================================================
+
+@lru_cache(maxsize=1024)
+def parse_time_spec(time_str: str) -> Optional[tuple]:
+    """
+    Parse the part of a time expression that doesn't depend on the clock, cached per phrase.
+    Returns ('in', timedelta) for relative times, ('at', hour, minute, push) for clock
+    times (push: "tomorrow" moves it a day even if it's still ahead today), or None.
+    Expects the lowercase time phrase as parse_input returns it.
+    """
+    # Drop "tomorrow" and note whether it was there in the same scan
+    time_str, tomorrow_count = TOMORROW_PATTERN.subn('', time_str)
+    is_tomorrow = tomorrow_count > 0
+    time_str = time_str.strip()
+    
+    # Special keywords: "lunch", "morning", ...
+    match = DAYPART_PATTERN.search(time_str)
+    if match:
+        hour, honors_tomorrow = DAYPART_HOURS[match.group()]
+        return ('at', hour, 0, honors_tomorrow and is_tomorrow)
+    
+    # Relative time: "in 2h 30m"
+    match = RELATIVE_PATTERN.search(time_str)
+    if match and (match.group(1) or match.group(2)):
+        hours = int(match.group(1)) if match.group(1) else 0
+        minutes = int(match.group(2)) if match.group(2) else 0
+        return ('in', timedelta(hours=hours, minutes=minutes))
+    
+    # 12-hour format: "5pm", "3:30am"
+    match = CLOCK_12H_PATTERN.search(time_str)
+    if match:
+        hour = int(match.group(1))
+        minute = int(match.group(2)) if match.group(2) else 0
+        period = match.group(3)
+        
+        if period == 'pm' and hour != 12:
+            hour += 12
+        elif period == 'am' and hour == 12:
+            hour = 0
+        
+        return ('at', hour, minute, is_tomorrow)
+    
+    # 24-hour format: "14:30"
+    match = CLOCK_24H_PATTERN.search(time_str)
+    if match:
+        return ('at', int(match.group(1)), int(match.group(2)), is_tomorrow)
+    
+    return None
+
+# ============================================================================
+# MESSAGES
+# ============================================================================
+
+class ParsedInput(NamedTuple):
+    """Everything handle_message needs from one reminder message"""
+    task: Optional[str]
+    time_str: Optional[str]
+    category: str
+    priority: str
+    notes: str
+    recurring: Optional[str]
+    shared_with: List[str]
+
+def parse_input(text: str, categories: Container[str]) -> ParsedInput:
+    """
+    Extract metadata, task and time from a reminder message in one pass;
+    a #tag only counts as the category if it's one of `categories`
+    Example: "Remind me to call mom at 5pm #personal !high -- bring cake"
+        -> task "call mom", time "at 5pm", category personal, priority high, notes "bring cake"
+    """
+    meta = {'category': 'other', 'priority': 'medium', 'notes': ''}
+    shared_with: List[str] = []
+    # The first tag and first priority decide; repeats of that same token are removed too
+    first: Dict[str, Optional[str]] = {}
+    
+    def take_metadata(match: re.Match) -> str:
+        """Record one #category, !priority, -- notes or @mention and cut it from the text"""
+        token = match.group()
+        kind = match.lastgroup
+        if kind is None:
+            return token
+        if kind == 'share':
+            shared_with.append(match.group('share'))
+            return ''
+        if kind == 'note':
+            if 'note' in first:
+                return token
+            first['note'] = token
+            meta['notes'] = match.group('note').strip()
+            return ''
+        if kind not in first:
+            first[kind] = token
+            if kind == 'pri':
+                meta['priority'] = match.group('pri').lower()
+            elif match.group('cat').lower() in categories:
+                meta['category'] = match.group('cat').lower()
+            else:
+                # An unknown first tag stays in the text, as does every later tag
+                first[kind] = None
+                return token
+        return '' if token == first[kind] else token
+    
+    # Extract category (#work), priority (!high), notes (-- Note text) and shared users (@username)
+    # in one scan; the substring checks skip it for plain text
+    if '#' in text or '!' in text or '--' in text or '@' in text:
+        text = METADATA_PATTERN.sub(take_metadata, text)
+    
+    # Everything below matches against this one lowercase copy
+    lt = text.lower()
+    
+    # Extract recurring patterns; anything other than "every day"/"daily" repeats weekly
+    recurring = None
+    recurring_match = RECURRING_PATTERN.search(lt)
+    if recurring_match:
+        recurring = 'daily' if recurring_match.group() in DAILY_PHRASES else 'weekly'
+    
+    # Split into task and time: "call mom at 5pm" -> ("call mom", "at 5pm");
+    # the time phrase comes from the lowercase copy, ready for parse_time
+    text = text.strip()
+    lt = lt.strip()
+    task = time_str = None
+    for trigger_match in TRIGGER_PATTERN.finditer(lt):
+        time_match = TIME_KEYWORD_PATTERN.search(lt, trigger_match.end())
+        if time_match:
+            task = text[trigger_match.end():time_match.start()].strip()
+            time_str = lt[time_match.start():].strip()
+            break
+    else:
+        # No trigger, just look for time pattern
+        time_match = TIME_KEYWORD_PATTERN.search(lt)
+        if time_match and text[:time_match.start()].strip():
+            task = text[:time_match.start()].strip()
+            time_str = lt[time_match.start():].strip()
+    
+    return ParsedInput(task, time_str, meta['category'], meta['priority'], meta['notes'], recurring, shared_with)
@@ -17,18 +17,43 @@ Designed for Render deployment with external keep-alive monitoring.
 import os
 import json
 import asyncio
-from datetime import datetime, timedelta
+import atexit
+import bisect
+import heapq
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters
 from telegram.constants import ChatAction
-import re
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 import random
+from functools import lru_cache
+from itertools import count, cycle
+from operator import itemgetter
 from threading import Lock
-import pytz
+from types import MappingProxyType
+from zoneinfo import ZoneInfo
 from typing import Dict, List, Optional, Tuple
 import logging
 
+from nlp_parse import parse_input, parse_time_spec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Configure logging
+logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s', level=logging.INFO)
+logger = logging.getLogger(__name__)
+
 # Import keep_alive for Render deployment
 try:
     from keep_alive import keep_alive
@@ -37,35 +62,52 @@ except ImportError:
     KEEP_ALIVE_AVAILABLE = False
     logger.warning("⚠️ keep_alive.py not found - running without web server")
 
-# Configure logging
-logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s', level=logging.INFO)
-logger = logging.getLogger(__name__)
-
 # ============================================================================
 # CONFIGURATION & CONSTANTS
 # ============================================================================
 
-# File storage paths
-REMINDERS_FILE = "reminders.json"
-USER_DATA_FILE = "user_data.json"
-STATS_FILE = "stats.json"
-HABITS_FILE = "habits.json"
-MOODS_FILE = "moods.json"
+# Database storage
+DB_FILE = "memoryping.db"
+
+@lru_cache(maxsize=256)
+def get_timezone(tz_name: str):
+    """Look up a timezone once per name instead of on every call"""
+    return ZoneInfo(tz_name)
 
 # Default settings
-DEFAULT_TIMEZONE = pytz.timezone('Asia/Kolkata')
+DEFAULT_TIMEZONE = get_timezone('Asia/Kolkata')
 XP_PER_COMPLETION = 10
 XP_PER_LEVEL = 100
 MAX_MESSAGE_LENGTH = 4000
 
-# Thread-safe file locks
-file_locks = {
-    'reminders': Lock(),
-    'user_data': Lock(),
-    'stats': Lock(),
-    'habits': Lock(),
-    'moods': Lock()
-}
+# Dirty rows are written to the database in one transaction this often (seconds)
+FLUSH_INTERVAL = 0.5
+
+# Due reminders are checked and sent this often (seconds)
+REMINDER_TICK_INTERVAL = 1.0
+
+# Auto-restart waits this long after a polling error, doubling up to the max (seconds)
+RESTART_DELAY = 5
+MAX_RESTART_DELAY = 60
+
+# Completed reminders are purged this long after creation, checked hourly
+COMPLETED_RETENTION_DAYS = 7
+REMINDER_GC_INTERVAL = 3600
+
+# Serializes access to the shared database connection
+db_lock = Lock()
+
+# Stores kept as one JSON document per user
+DOCUMENT_STORES = ('user_data', 'habits', 'moods')
+
+# Habit entries kept per user for pattern detection
+HABIT_HISTORY = 100
+
+# One private generator for tones and footers, so picks don't go through the module-level functions
+_RNG = random.Random()
+
+# Shared read-only default for lookups of users with no stored data yet
+_EMPTY = MappingProxyType({})
 
 # ============================================================================
 # PERSONALITY ENGINE - 4 Distinct Bot Personalities
@@ -146,11 +188,19 @@ PERSONALITIES = {
     }
 }
 
+# Response pools flattened to (personality, response_type) -> messages
+RESPONSE_TONES = {
+    (personality, response_type): tuple(messages)
+    for personality, config in PERSONALITIES.items()
+    for response_type, messages in config.items()
+    if response_type != 'name'
+}
+
 # ============================================================================
 # GAMIFICATION SYSTEM - Quotes, Tips, Achievements
 # ============================================================================
 
-MOTIVATIONAL_QUOTES = [
+MOTIVATIONAL_QUOTES = (
     "The secret of getting ahead is getting started.",
     "Small daily improvements lead to stunning results.",
     "Progress, not perfection.",
@@ -159,9 +209,9 @@ MOTIVATIONAL_QUOTES = [
     "Success is the sum of small efforts repeated day in and day out.",
     "Dream big. Start small. Act now.",
     "Your future self will thank you."
-]
+)
 
-TIPS = [
+TIPS = (
     "💡 Tip: Tag reminders with #work #health for organization!",
     "💡 Pro tip: Add !high for urgent reminders",
     "💡 Try /digest for a daily summary of your productivity",
@@ -172,7 +222,26 @@ TIPS = [
     "💡 Snooze is your friend - don't stress!",
     "💡 Build streaks for bonus XP",
     "💡 Try natural language: 'workout in 30 minutes'"
-]
+)
+
+def build_footer_cycle() -> Tuple[str, ...]:
+    """
+    Prerender the footer rotation: credits every 10th message, a quote every
+    other 5th, a tip otherwise. Long enough to show every quote once.
+    """
+    quotes = cycle(_RNG.sample(MOTIVATIONAL_QUOTES, len(MOTIVATIONAL_QUOTES)))
+    tips = cycle(_RNG.sample(TIPS, len(TIPS)))
+    footers = []
+    for n in range(1, 10 * len(MOTIVATIONAL_QUOTES) + 1):
+        if n % 10 == 0:
+            footers.append("\n\n_✨ MemoryPing v4.0 by Achu Vijayakumar_")
+        elif n % 5 == 0:
+            footers.append(f"\n\n💭 _{next(quotes)}_")
+        else:
+            footers.append(f"\n\n{next(tips)}")
+    return tuple(footers)
+
+FOOTER_CYCLE = build_footer_cycle()
 
 CATEGORIES = {
     'work': '💼',
@@ -249,54 +318,401 @@ ACHIEVEMENTS = {
     }
 }
 
+# Leading emoji of each achievement name, shown as badges in /stats
+ACHIEVEMENT_EMOJI = {key: achievement['name'].split()[0] for key, achievement in ACHIEVEMENTS.items()}
+
+# Completion counts that unlock an achievement
+MILESTONES = {
+    1: 'first_reminder',
+    10: 'complete_10',
+    50: 'complete_50',
+    100: 'complete_100'
+}
+
 # ============================================================================
 # DATA MANAGER - Thread-Safe Data Persistence
 # ============================================================================
 
 class DataManager:
-    """Handles all data persistence with thread-safe file operations"""
+    """Handles all data persistence in SQLite, mirrored in memory for reads"""
     
     def __init__(self):
-        self.reminders = self._load('reminders')
-        self.user_data = self._load('user_data')
-        self.stats = self._load('stats')
-        self.habits = self._load('habits')
-        self.moods = self._load('moods')
+        self.db = self._connect()
+        self.reminders = self._load_reminders()
+        self.stats = self._load_stats()
+        self.user_data = self._load_documents('user_data')
+        # Achievements are kept as sets in memory for O(1) "already unlocked?" checks
+        for user in self.user_data.values():
+            if 'achievements' in user:
+                user['achievements'] = set(user['achievements'])
+        # Habit history is a bounded deque, so appends evict the oldest entry for free
+        self.habits = {
+            cid: deque(history, maxlen=HABIT_HISTORY)
+            for cid, history in self._load_documents('habits').items()
+        }
+        self.moods = self._load_documents('moods')
         self.message_count = 0
-    
-    def _load(self, key: str) -> dict:
-        """Load JSON data from file with error handling"""
+        
+        # Parsed reminder times, so listings don't re-parse the ISO strings
+        self.time_cache = {}
+        
+        # Small integer ids used in button callback data instead of the long reminder ids
+        # Ids only ever go up, so a stale button can't reach a newer reminder; the counter is
+        # stored in the meta table and written with every flush
+        self.short_ids = {reminder['short_id']: reminder_id for reminder_id, reminder in self.reminders.items()}
+        stored = self.db.execute("SELECT value FROM meta WHERE key = 'next_short_id'").fetchone()
+        self.next_short_id = max(stored[0] if stored else 1, max(self.short_ids, default=0) + 1)
+        # Suffix for new reminder ids; seeded with the clock in ms so ids stay unique across restarts
+        self.id_counter = count(int(time.time() * 1000))
+        
+        # Active reminder ids by owner, by each user they're shared with, and by category
+        self.by_chat = defaultdict(set)
+        self.shared_index = defaultdict(set)
+        self.by_category = defaultdict(set)
+        # Each owner's and sharee's active reminders as sorted (fire timestamp, id) lists,
+        # so time-range listings bisect instead of scanning
+        self.schedule = defaultdict(list)
+        # Min-heap of (fire timestamp, reminder id) for active reminders. Completed,
+        # deleted and rescheduled entries are left in place and skipped when popped.
+        self.pending = []
+        for reminder_id, reminder in self.reminders.items():
+            if reminder.get('completed'):
+                continue
+            try:
+                entry = self._pending_entry(reminder_id)
+            except (KeyError, TypeError, ValueError) as e:
+                # A reminder whose time can't be read is left out rather than failing startup
+                logger.error(f"Error rescheduling reminder {reminder_id}: {e}")
+                continue
+            self.index_reminder(reminder_id)
+            self.pending.append(entry)
+        heapq.heapify(self.pending)
+        # (store, row id) pairs changed since the last flush
+        self._dirty = set()
+        atexit.register(self.flush)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating tables and importing JSON files on first run"""
+        db = sqlite3.connect(DB_FILE, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS reminders ("
+            "id TEXT PRIMARY KEY, chat_id INTEGER, message TEXT, time TEXT, recurring TEXT, "
+            "category TEXT, priority TEXT, notes TEXT, shared_with TEXT, completed INTEGER, created_at TEXT, "
+            "short_id INTEGER)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS idx_rem_chat ON reminders(chat_id, completed, time)")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS stats ("
+            "chat_id TEXT PRIMARY KEY, created INTEGER, completed INTEGER, snoozed INTEGER, xp INTEGER)"
+        )
+        for key in DOCUMENT_STORES:
+            db.execute(f"CREATE TABLE IF NOT EXISTS {key} (chat_id TEXT PRIMARY KEY, data TEXT)")
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            # Import and version bump commit together, so a crash mid-import is retried
+            db.execute("BEGIN")
+            self.db = db
+            self._import_json()
+            db.execute("PRAGMA user_version = 1")
+            db.execute("COMMIT")
+        if version < 2:
+            # Short ids for button callbacks; existing rows get their rowid, which is already unique
+            db.execute("BEGIN")
+            columns = {row[1] for row in db.execute("PRAGMA table_info(reminders)")}
+            if 'short_id' not in columns:
+                db.execute("ALTER TABLE reminders ADD COLUMN short_id INTEGER")
+            db.execute("UPDATE reminders SET short_id = rowid WHERE short_id IS NULL")
+            db.execute("PRAGMA user_version = 2")
+            db.execute("COMMIT")
+        if version < 3:
+            # Persist the short id counter so ids of removed reminders are never handed out again
+            db.execute("BEGIN")
+            db.execute(
+                "INSERT OR IGNORE INTO meta VALUES "
+                "('next_short_id', (SELECT COALESCE(MAX(short_id), 0) + 1 FROM reminders))"
+            )
+            db.execute("PRAGMA user_version = 3")
+            db.execute("COMMIT")
+        return db
+    
+    def _import_json(self):
+        """Copy the old per-store JSON files into the database"""
+        # Read and parse the files in parallel; the inserts stay on this thread's connection
+        keys = ('reminders', 'stats') + DOCUMENT_STORES
+        with ThreadPoolExecutor(max_workers=len(keys)) as pool:
+            loaded = dict(zip(keys, pool.map(self._load_json, keys)))
+        for key in keys:
+            setattr(self, key, loaded[key])
+            for row_id in loaded[key]:
+                self._write_row(key, row_id)
+        logger.info(f"📦 Imported {len(self.reminders)} reminders from JSON into {DB_FILE}")
+    
+    def _load_json(self, key: str) -> dict:
+        """Load a legacy JSON file with error handling"""
+        # Each store lived in its own file named after it (reminders.json, user_data.json, ...)
         filepath = f"{key}.json"
         if os.path.exists(filepath):
             try:
-                with file_locks[key], open(filepath, 'r') as f:
-                    return json.load(f)
+                with open(filepath, 'rb') as f:
+                    return self._decode(f.read())
             except Exception as e:
                 logger.error(f"Error loading {filepath}: {e}")
         return {}
     
-    def _save(self, data: dict, key: str):
-        """Save JSON data to file with thread safety"""
+    def _load_reminders(self) -> dict:
+        """Load every reminder row into memory"""
+        return {
+            reminder_id: {
+                'chat_id': chat_id,
+                'message': message,
+                'time': time,
+                'recurring': recurring,
+                'category': category,
+                'priority': priority,
+                'notes': notes,
+                'shared_with': self._decode(shared_with),
+                'completed': bool(completed),
+                'created_at': created_at,
+                'short_id': short_id,
+                # Display-only, derived once here rather than on every render; not stored
+                'cat_emoji': CATEGORIES.get(category, '📌'),
+                'pri_emoji': PRIORITIES.get(priority, '🟡')
+            }
+            for reminder_id, chat_id, message, time, recurring, category, priority,
+                notes, shared_with, completed, created_at, short_id
+            in self.db.execute("SELECT * FROM reminders")
+        }
+    
+    def _load_stats(self) -> dict:
+        """Load every user's stats row into memory"""
+        return {
+            int(cid): {'created': created, 'completed': completed, 'snoozed': snoozed, 'xp': xp}
+            for cid, created, completed, snoozed, xp in self.db.execute("SELECT * FROM stats")
+        }
+    
+    def _load_documents(self, key: str) -> dict:
+        """Load a per-user JSON document store into memory"""
+        return {int(cid): self._decode(data) for cid, data in self.db.execute(f"SELECT * FROM {key}")}
+    
+    def get_time(self, reminder_id: str) -> datetime:
+        """Get a reminder's time as a datetime, parsing it at most once"""
+        remind_time = self.time_cache.get(reminder_id)
+        if remind_time is None:
+            remind_time = datetime.fromisoformat(self.reminders[reminder_id]['time'])
+            # Times from older versions may be naive; pin them to the default zone once here
+            if remind_time.tzinfo is None:
+                remind_time = remind_time.replace(tzinfo=DEFAULT_TIMEZONE)
+            self.time_cache[reminder_id] = remind_time
+        return remind_time
+    
+    def set_time(self, reminder_id: str, remind_time: datetime):
+        """Change a reminder's time, keeping the parsed cache and schedules in step"""
+        active = not self.reminders[reminder_id].get('completed')
+        if active:
+            self._unschedule(reminder_id)
+        self.reminders[reminder_id]['time'] = remind_time.isoformat()
+        self.time_cache[reminder_id] = remind_time
+        if active:
+            self._schedule(reminder_id)
+        self.push_pending(reminder_id)
+    
+    def remove_reminder(self, reminder_id: str):
+        """Drop a reminder from memory and every index, and queue its row for deletion"""
+        self.unindex_reminder(reminder_id)
+        self.short_ids.pop(self.reminders[reminder_id]['short_id'], None)
+        del self.reminders[reminder_id]
+        self.time_cache.pop(reminder_id, None)
+        self.save_reminders(reminder_id)
+    
+    def gc_reminders(self, now: datetime) -> int:
+        """Delete completed reminders created more than COMPLETED_RETENTION_DAYS ago; returns how many"""
+        cutoff = (now - timedelta(days=COMPLETED_RETENTION_DAYS)).isoformat()
+        stale = [
+            reminder_id for reminder_id, reminder in self.reminders.items()
+            if reminder.get('completed') and (reminder.get('created_at') or '') < cutoff
+        ]
+        for reminder_id in stale:
+            self.remove_reminder(reminder_id)
+        return len(stale)
+    
+    def _pending_entry(self, reminder_id: str) -> Tuple[float, str]:
+        """Build a reminder's (fire timestamp, id) heap entry"""
+        return self.get_time(reminder_id).timestamp(), reminder_id
+    
+    def push_pending(self, reminder_id: str):
+        """Queue an active reminder at its current time"""
+        heapq.heappush(self.pending, self._pending_entry(reminder_id))
+        # Snoozes and recurring reminders leave stale entries behind; rebuild once they dominate.
+        # Compact in place: reminder_tick may be draining this same list while it sends.
+        if len(self.pending) > 2 * len(self.reminders) + 64:
+            self.pending[:] = [entry for entry in self.pending if self.is_pending(*entry)]
+            heapq.heapify(self.pending)
+    
+    def is_pending(self, timestamp: float, reminder_id: str) -> bool:
+        """Check a heap entry still matches an active reminder's current time"""
+        reminder = self.reminders.get(reminder_id)
+        if reminder is None or reminder.get('completed'):
+            return False
+        return self._pending_entry(reminder_id)[0] == timestamp
+    
+    def index_reminder(self, reminder_id: str):
+        """Add an active reminder to the per-user indexes"""
+        reminder = self.reminders[reminder_id]
+        self.by_chat[reminder['chat_id']].add(reminder_id)
+        self.by_category[reminder.get('category', 'other')].add(reminder_id)
+        for user in reminder.get('shared_with', []):
+            self.shared_index[user].add(reminder_id)
+        self._schedule(reminder_id)
+    
+    def unindex_reminder(self, reminder_id: str):
+        """Remove a completed or deleted reminder from the per-user indexes"""
+        reminder = self.reminders[reminder_id]
+        self.by_chat[reminder['chat_id']].discard(reminder_id)
+        self.by_category[reminder.get('category', 'other')].discard(reminder_id)
+        for user in reminder.get('shared_with', []):
+            self.shared_index[user].discard(reminder_id)
+        self._unschedule(reminder_id)
+    
+    def _schedule_users(self, reminder_id: str) -> set:
+        """The users whose schedules list a reminder: its owner and everyone it's shared with"""
+        reminder = self.reminders[reminder_id]
+        return {reminder['chat_id'], *reminder.get('shared_with', [])}
+    
+    def _schedule(self, reminder_id: str):
+        """Insert a reminder into its users' schedules at its current time"""
+        entry = self._pending_entry(reminder_id)
+        for user in self._schedule_users(reminder_id):
+            bisect.insort(self.schedule[user], entry)
+    
+    def _unschedule(self, reminder_id: str):
+        """Remove a reminder's entry at its current time from its users' schedules"""
+        entry = self._pending_entry(reminder_id)
+        for user in self._schedule_users(reminder_id):
+            entries = self.schedule.get(user)
+            if entries:
+                index = bisect.bisect_left(entries, entry)
+                if index < len(entries) and entries[index] == entry:
+                    del entries[index]
+    
+    def scheduled_between(self, user, start: float, end: float) -> List[str]:
+        """Ids of a user's active reminders due in [start, end] (timestamps), soonest first"""
+        entries = self.schedule.get(user, ())
+        due = []
+        for index in range(bisect.bisect_left(entries, (start,)), len(entries)):
+            timestamp, reminder_id = entries[index]
+            if timestamp > end:
+                break
+            due.append(reminder_id)
+        return due
+    
+    @staticmethod
+    def _to_json(value) -> list:
+        """Convert the in-memory containers JSON doesn't know about to lists"""
+        # Sets (achievements) are stored sorted; deques (habit history) in order
+        if isinstance(value, set):
+            return sorted(value)
+        if isinstance(value, deque):
+            return list(value)
+        raise TypeError(f"Can't serialize {type(value).__name__}")
+    
+    @staticmethod
+    def _encode(value) -> str:
+        """Serialize a stored value as compact JSON, keeping emoji and other text unescaped"""
+        if orjson:
+            return orjson.dumps(value, default=DataManager._to_json).decode()
+        return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=DataManager._to_json)
+    
+    @staticmethod
+    def _decode(data):
+        """Parse JSON text or bytes"""
+        if orjson:
+            return orjson.loads(data)
+        return json.loads(data)
+    
+    def _row_statement(self, key: str, row_id: str) -> Tuple[str, tuple]:
+        """Build the SQL that writes one row from memory, or deletes it if it's no longer there"""
+        value = getattr(self, key).get(row_id)
+        if value is None:
+            column = 'id' if key == 'reminders' else 'chat_id'
+            return f"DELETE FROM {key} WHERE {column} = ?", (row_id,)
+        if key == 'reminders':
+            return (
+                "INSERT OR REPLACE INTO reminders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    row_id, value['chat_id'], value['message'], value['time'],
+                    value.get('recurring'), value.get('category', 'other'),
+                    value.get('priority', 'medium'), value.get('notes', ''),
+                    self._encode(value.get('shared_with', [])), int(bool(value.get('completed'))),
+                    value.get('created_at'), value.get('short_id')
+                )
+            )
+        if key == 'stats':
+            return (
+                "INSERT OR REPLACE INTO stats VALUES (?, ?, ?, ?, ?)",
+                (row_id, value.get('created', 0), value.get('completed', 0), value.get('snoozed', 0), value.get('xp', 0))
+            )
+        return f"INSERT OR REPLACE INTO {key} VALUES (?, ?)", (row_id, self._encode(value))
+    
+    def _write_row(self, key: str, row_id: str):
+        """Write one row from memory, or delete it if it's no longer there"""
+        self.db.execute(*self._row_statement(key, row_id))
+    
+    def _take_dirty(self) -> Tuple[set, list]:
+        """Claim the dirty rows and snapshot them as SQL while the in-memory data can't change"""
+        dirty, self._dirty = self._dirty, set()
+        statements = [self._row_statement(key, row_id) for key, row_id in dirty]
+        # The short id counter rides along, so it's never behind the reminder rows it numbered
+        statements.append(("INSERT OR REPLACE INTO meta VALUES ('next_short_id', ?)", (self.next_short_id,)))
+        return dirty, statements
+    
+    def _commit(self, dirty: set, statements: list):
+        """Run a snapshot's statements in a single transaction; safe to call from a worker thread"""
+        with db_lock:
+            try:
+                self.db.execute("BEGIN")
+                for sql, params in statements:
+                    self.db.execute(sql, params)
+                self.db.execute("COMMIT")
+            except sqlite3.Error as e:
+                logger.error(f"Error flushing {len(dirty)} rows: {e}")
+                if self.db.in_transaction:
+                    self.db.execute("ROLLBACK")
+                # Keep the rows dirty so the next flush retries them
+                self._dirty |= dirty
+    
+    def flush(self):
+        """Write every dirty row in a single transaction"""
+        if self._dirty:
+            self._commit(*self._take_dirty())
+    
+    async def run_flusher(self):
+        """Flush dirty rows every FLUSH_INTERVAL seconds until cancelled, writing off the event loop"""
         try:
-            with file_locks[key], open(f"{key}.json", 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving {key}: {e}")
+            while True:
+                await asyncio.sleep(FLUSH_INTERVAL)
+                if self._dirty:
+                    await asyncio.to_thread(self._commit, *self._take_dirty())
+        finally:
+            self.flush()
     
-    def save_reminders(self):
-        self._save(self.reminders, 'reminders')
+    def save_reminders(self, reminder_id: str):
+        self._dirty.add(('reminders', reminder_id))
     
-    def save_user_data(self):
-        self._save(self.user_data, 'user_data')
+    def save_user_data(self, chat_id: int):
+        self._dirty.add(('user_data', chat_id))
     
-    def save_stats(self):
-        self._save(self.stats, 'stats')
+    def save_stats(self, chat_id: int):
+        self._dirty.add(('stats', chat_id))
     
-    def save_habits(self):
-        self._save(self.habits, 'habits')
+    def save_habits(self, chat_id: int):
+        self._dirty.add(('habits', chat_id))
     
-    def save_moods(self):
-        self._save(self.moods, 'moods')
+    def save_moods(self, chat_id: int):
+        self._dirty.add(('moods', chat_id))
 
 # ============================================================================
 # MEMORY PING ENGINE - Core Business Logic
@@ -307,6 +723,14 @@ class MemoryPingEngine:
     
     def __init__(self, data: DataManager):
         self.data = data
+        # Per-chat personality and timezone, cleared by invalidate() when the user changes them
+        self._personality_cache = {}
+        self._tz_cache = {}
+    
+    def invalidate(self, chat_id: int):
+        """Forget a user's cached personality and timezone after a settings change"""
+        self._personality_cache.pop(chat_id, None)
+        self._tz_cache.pop(chat_id, None)
     
     # ------------------------------------------------------------------------
     # Personality System
@@ -314,19 +738,22 @@ class MemoryPingEngine:
     
     def get_user_personality(self, chat_id: int) -> str:
         """Get user's selected personality (default: bestie)"""
-        cid = str(chat_id)
-        if cid not in self.data.user_data:
-            self.data.user_data[cid] = {
-                'personality': 'bestie',
-                'timezone': 'Asia/Kolkata'
-            }
-        return self.data.user_data[cid].get('personality', 'bestie')
+        personality = self._personality_cache.get(chat_id)
+        if personality is None:
+            if chat_id not in self.data.user_data:
+                self.data.user_data[chat_id] = {
+                    'personality': 'bestie',
+                    'timezone': 'Asia/Kolkata'
+                }
+            personality = self.data.user_data[chat_id].get('personality', 'bestie')
+            self._personality_cache[chat_id] = personality
+        return personality
     
     def get_response_tone(self, chat_id: int, response_type: str = "confirmation") -> str:
         """Get personality-based response message"""
         personality = self.get_user_personality(chat_id)
-        messages = PERSONALITIES.get(personality, PERSONALITIES['bestie'])[response_type]
-        return random.choice(messages)
+        messages = RESPONSE_TONES.get((personality, response_type)) or RESPONSE_TONES[('bestie', response_type)]
+        return _RNG.choice(messages)
     
     # ------------------------------------------------------------------------
     # XP & Leveling System
@@ -334,26 +761,61 @@ class MemoryPingEngine:
     
     def get_user_xp(self, chat_id: int) -> int:
         """Get user's total XP"""
-        cid = str(chat_id)
-        return self.data.stats.get(cid, {}).get('xp', 0)
+        return self.data.stats.get(chat_id, _EMPTY).get('xp', 0)
     
     def get_user_level(self, chat_id: int) -> int:
-        """Calculate user's level from XP"""
-        return max(1, self.get_user_xp(chat_id) // XP_PER_LEVEL + 1)
+        """Get user's level, derived from XP"""
+        return self._get_derived_stats(chat_id).get('level', 1)
+    
+    def _user_rows(self, chat_id: int) -> Tuple[dict, dict]:
+        """Get a user's stats and user_data rows in one go, creating them if missing"""
+        stats = self.data.stats.get(chat_id)
+        if stats is None:
+            stats = self.data.stats[chat_id] = {'created': 0, 'completed': 0, 'snoozed': 0, 'xp': 0}
+        user = self.data.user_data.get(chat_id)
+        if user is None:
+            user = self.data.user_data[chat_id] = {'achievements': set()}
+        return stats, user
+    
+    @staticmethod
+    def _refresh_derived_stats(stats: dict):
+        """
+        Recompute level and completion rate after a counter changes.
+        They are kept in memory only; the database stores just the counters.
+        """
+        xp = stats.get('xp', 0)
+        created = stats.get('created', 0)
+        
+        stats['level'] = max(1, xp // XP_PER_LEVEL + 1)
+        stats['completion_rate'] = (stats.get('completed', 0) / created * 100) if created > 0 else 0
+    
+    def _get_derived_stats(self, chat_id: int) -> dict:
+        """Get user's stats with the derived values filled in"""
+        stats = self.data.stats.get(chat_id)
+        if stats is None:
+            return {}
+        if 'level' not in stats:
+            self._refresh_derived_stats(stats)
+        return stats
     
     def update_xp(self, chat_id: int, amount: int) -> Tuple[Optional[str], int]:
         """
         Update user XP and check for level up
         Returns: (achievement_type, new_level)
         """
-        cid = str(chat_id)
-        if cid not in self.data.stats:
-            self.data.stats[cid] = {'xp': 0}
-        
-        old_level = self.get_user_level(chat_id)
-        self.data.stats[cid]['xp'] = max(0, self.data.stats[cid].get('xp', 0) + amount)
-        new_level = self.get_user_level(chat_id)
-        self.data.save_stats()
+        if chat_id not in self.data.stats:
+            self.data.stats[chat_id] = {'xp': 0}
+        return self._add_xp(chat_id, self.data.stats[chat_id], amount)
+    
+    def _add_xp(self, chat_id: int, stats: dict, amount: int) -> Tuple[Optional[str], int]:
+        """update_xp on an already-resolved stats row"""
+        if 'level' not in stats:
+            self._refresh_derived_stats(stats)
+        old_level = stats['level']
+        stats['xp'] = max(0, stats.get('xp', 0) + amount)
+        self._refresh_derived_stats(stats)
+        new_level = stats['level']
+        self.data.save_stats(chat_id)
         
         if new_level > old_level:
             return ('level_up', new_level)
@@ -361,21 +823,19 @@ class MemoryPingEngine:
     
     def calculate_memory_score(self, chat_id: int) -> int:
         """
-        Calculate Memory Score (0-1000) based on:
+        Memory Score (0-1000) based on:
         - XP earned
         - Completion rate
         - Streak days
+        Worked out on each read, since the streak can change without touching the stats row.
         """
-        stats = self.data.stats.get(str(chat_id), {})
-        xp = stats.get('xp', 0)
-        created = stats.get('created', 0)
-        completed = stats.get('completed', 0)
-        
-        completion_rate = (completed / created * 100) if created > 0 else 0
+        stats = self._get_derived_stats(chat_id)
         streak = self.get_streak(chat_id)
-        
-        score = int((xp / 10) + (completion_rate * 2) + (streak * 5))
-        return min(1000, score)
+        return min(1000, int((stats.get('xp', 0) / 10) + (stats.get('completion_rate', 0) * 2) + (streak * 5)))
+    
+    def get_completion_rate(self, chat_id: int) -> float:
+        """Percentage of created reminders that were completed"""
+        return self._get_derived_stats(chat_id).get('completion_rate', 0)
     
     # ------------------------------------------------------------------------
     # Reminder Management
@@ -383,41 +843,63 @@ class MemoryPingEngine:
     
     def add_reminder(self, chat_id: int, message: str, remind_time: datetime, **kwargs) -> str:
         """Create a new reminder and return its ID"""
-        reminder_id = f"{chat_id}_{remind_time.timestamp()}_{len(self.data.reminders)}"
+        reminder_id = f"{chat_id}_{next(self.data.id_counter)}"
+        created_at = datetime.now().isoformat()
+        short_id = self.data.next_short_id
+        self.data.next_short_id += 1
+        self.data.short_ids[short_id] = reminder_id
+        
+        category = kwargs.get('category', 'other')
+        priority = kwargs.get('priority', 'medium')
         
         self.data.reminders[reminder_id] = {
             'chat_id': chat_id,
             'message': message,
             'time': remind_time.isoformat(),
             'recurring': kwargs.get('recurring'),
-            'category': kwargs.get('category', 'other'),
-            'priority': kwargs.get('priority', 'medium'),
+            'category': category,
+            'priority': priority,
             'notes': kwargs.get('notes', ''),
             'shared_with': kwargs.get('shared_with', []),
             'completed': False,
-            'created_at': datetime.now().isoformat()
+            'created_at': created_at,
+            'short_id': short_id,
+            'cat_emoji': CATEGORIES.get(category, '📌'),
+            'pri_emoji': PRIORITIES.get(priority, '🟡')
         }
         
-        self.data.save_reminders()
+        self.data.time_cache[reminder_id] = remind_time
+        self.data.index_reminder(reminder_id)
+        self.data.push_pending(reminder_id)
+        self.data.save_reminders(reminder_id)
         self.update_stats(chat_id, 'created')
         
         # Track for habit analysis
-        self._track_habit(chat_id, message, remind_time)
+        self._track_habit(chat_id, message, remind_time, created_at)
         
         return reminder_id
     
     def get_user_reminders(self, chat_id: int, category: str = None) -> dict:
         """Get all active reminders for a user"""
-        reminders = {
-            k: v for k, v in self.data.reminders.items()
-            if (v['chat_id'] == chat_id or chat_id in v.get('shared_with', []))
-            and not v.get('completed')
-        }
-        
+        reminder_ids = self.data.by_chat.get(chat_id, set()) | self.data.shared_index.get(chat_id, set())
         if category:
-            reminders = {k: v for k, v in reminders.items() if v.get('category') == category}
-        
-        return reminders
+            reminder_ids &= self.data.by_category.get(category, set())
+        return {k: self.data.reminders[k] for k in reminder_ids}
+    
+    def get_reminders_between(self, chat_id: int, start: datetime, end: datetime) -> List[Tuple[str, dict, datetime]]:
+        """Get a user's active reminders due in [start, end] as (id, reminder, time), soonest first"""
+        return self._scheduled_rows(chat_id, start.timestamp(), end.timestamp())
+    
+    def get_scheduled_reminders(self, chat_id: int) -> List[Tuple[str, dict, datetime]]:
+        """Get all of a user's active reminders as (id, reminder, time), soonest first"""
+        return self._scheduled_rows(chat_id, float('-inf'), float('inf'))
+    
+    def _scheduled_rows(self, chat_id: int, start: float, end: float) -> List[Tuple[str, dict, datetime]]:
+        """Read a slice of the user's sorted schedule as (id, reminder, time) rows"""
+        return [
+            (reminder_id, self.data.reminders[reminder_id], self.data.get_time(reminder_id))
+            for reminder_id in self.data.scheduled_between(chat_id, start, end)
+        ]
     
     def complete_reminder(self, reminder_id: str) -> Tuple[bool, Optional[dict], int]:
         """
@@ -426,16 +908,19 @@ class MemoryPingEngine:
         """
         if reminder_id in self.data.reminders:
             self.data.reminders[reminder_id]['completed'] = True
-            self.data.save_reminders()
+            self.data.unindex_reminder(reminder_id)
+            self.data.save_reminders(reminder_id)
             
+            # Resolve the user's rows once for the stats, XP and achievement updates
             chat_id = self.data.reminders[reminder_id]['chat_id']
-            self.update_stats(chat_id, 'completed')
+            stats, user = self._user_rows(chat_id)
+            stats['completed'] = stats.get('completed', 0) + 1
             
-            # Award XP
-            ach_key, level = self.update_xp(chat_id, XP_PER_COMPLETION)
+            # Award XP; this also refreshes the derived stats and saves the row
+            ach_key, level = self._add_xp(chat_id, stats, XP_PER_COMPLETION)
             
             # Check for achievements
-            achievement = self.check_achievements(chat_id)
+            achievement = self.check_achievements(chat_id, stats, user)
             
             return True, achievement, level
         return False, None, 0
@@ -443,18 +928,16 @@ class MemoryPingEngine:
     def delete_reminder(self, reminder_id: str) -> bool:
         """Delete a reminder"""
         if reminder_id in self.data.reminders:
-            del self.data.reminders[reminder_id]
-            self.data.save_reminders()
+            self.data.remove_reminder(reminder_id)
             return True
         return False
     
     def snooze_reminder(self, reminder_id: str, minutes: int) -> Optional[datetime]:
         """Snooze reminder by X minutes"""
         if reminder_id in self.data.reminders:
-            current_time = datetime.fromisoformat(self.data.reminders[reminder_id]['time'])
-            new_time = current_time + timedelta(minutes=minutes)
-            self.data.reminders[reminder_id]['time'] = new_time.isoformat()
-            self.data.save_reminders()
+            new_time = self.data.get_time(reminder_id) + timedelta(minutes=minutes)
+            self.data.set_time(reminder_id, new_time)
+            self.data.save_reminders(reminder_id)
             return new_time
         return None
     
@@ -464,62 +947,45 @@ class MemoryPingEngine:
     
     def update_stats(self, chat_id: int, action: str):
         """Update user statistics"""
-        cid = str(chat_id)
-        if cid not in self.data.stats:
-            self.data.stats[cid] = {
+        if chat_id not in self.data.stats:
+            self.data.stats[chat_id] = {
                 'created': 0,
                 'completed': 0,
                 'snoozed': 0,
                 'xp': 0
             }
-        self.data.stats[cid][action] = self.data.stats[cid].get(action, 0) + 1
-        self.data.save_stats()
+        self.data.stats[chat_id][action] = self.data.stats[chat_id].get(action, 0) + 1
+        self._refresh_derived_stats(self.data.stats[chat_id])
+        self.data.save_stats(chat_id)
     
     def get_streak(self, chat_id: int) -> int:
         """Get user's current streak"""
-        return self.data.user_data.get(str(chat_id), {}).get('streak', 0)
+        return self.data.user_data.get(chat_id, _EMPTY).get('streak', 0)
     
-    def check_achievements(self, chat_id: int) -> Optional[dict]:
-        """Check if user unlocked any achievements"""
-        cid = str(chat_id)
-        stats = self.data.stats.get(cid, {})
-        
-        if cid not in self.data.user_data:
-            self.data.user_data[cid] = {'achievements': []}
-        
-        user_achs = self.data.user_data[cid].get('achievements', [])
+    def check_achievements(self, chat_id: int, stats: dict, user: dict) -> Optional[dict]:
+        """Check if user unlocked any achievements, given their resolved stats and user_data rows"""
+        user_achs = user.setdefault('achievements', set())
         completed = stats.get('completed', 0)
         
         # Check milestone achievements
-        milestones = [
-            (1, 'first_reminder'),
-            (10, 'complete_10'),
-            (50, 'complete_50'),
-            (100, 'complete_100')
-        ]
-        
-        for milestone, ach_key in milestones:
-            if completed == milestone and ach_key not in user_achs:
-                user_achs.append(ach_key)
-                self.data.user_data[cid]['achievements'] = user_achs
-                self.data.save_user_data()
-                
-                # Award XP bonus
-                xp_reward = ACHIEVEMENTS[ach_key]['xp']
-                if xp_reward > 0:
-                    self.update_xp(chat_id, xp_reward)
-                
-                return ACHIEVEMENTS[ach_key]
+        ach_key = MILESTONES.get(completed)
+        if ach_key and ach_key not in user_achs:
+            user_achs.add(ach_key)
+            self.data.save_user_data(chat_id)
+            
+            # Award XP bonus
+            xp_reward = ACHIEVEMENTS[ach_key]['xp']
+            if xp_reward > 0:
+                self._add_xp(chat_id, stats, xp_reward)
+            
+            return ACHIEVEMENTS[ach_key]
         
         return None
     
     def check_time_achievements(self, chat_id: int, remind_time: datetime) -> Optional[dict]:
         """Check for time-based achievements (early bird, night owl)"""
-        cid = str(chat_id)
-        if cid not in self.data.user_data:
-            self.data.user_data[cid] = {'achievements': []}
-        
-        user_achs = self.data.user_data[cid].get('achievements', [])
+        stats, user = self._user_rows(chat_id)
+        user_achs = user.setdefault('achievements', set())
         hour = remind_time.hour
         
         ach_key = None
@@ -529,35 +995,29 @@ class MemoryPingEngine:
             ach_key = 'night_owl'
         
         if ach_key:
-            user_achs.append(ach_key)
-            self.data.user_data[cid]['achievements'] = user_achs
-            self.data.save_user_data()
-            self.update_xp(chat_id, ACHIEVEMENTS[ach_key]['xp'])
+            user_achs.add(ach_key)
+            self.data.save_user_data(chat_id)
+            self._add_xp(chat_id, stats, ACHIEVEMENTS[ach_key]['xp'])
             return ACHIEVEMENTS[ach_key]
         
         return None
     
     def check_category_achievement(self, chat_id: int) -> Optional[dict]:
         """Check if user has used all categories"""
-        cid = str(chat_id)
-        if cid not in self.data.user_data:
+        if chat_id not in self.data.user_data:
             return None
         
-        user_achs = self.data.user_data[cid].get('achievements', [])
+        user_achs = self.data.user_data[chat_id].setdefault('achievements', set())
         if 'organized' in user_achs:
             return None
         
         # Get all categories used
-        user_reminders = self.get_user_reminders(chat_id)
-        categories_used = set()
-        for reminder in user_reminders.values():
-            categories_used.add(reminder.get('category', 'other'))
+        categories_used = {reminder.get('category', 'other') for reminder in self.get_user_reminders(chat_id).values()}
         
         # Check if all categories used
         if len(categories_used) >= len(CATEGORIES):
-            user_achs.append('organized')
-            self.data.user_data[cid]['achievements'] = user_achs
-            self.data.save_user_data()
+            user_achs.add('organized')
+            self.data.save_user_data(chat_id)
             self.update_xp(chat_id, ACHIEVEMENTS['organized']['xp'])
             return ACHIEVEMENTS['organized']
         
@@ -567,29 +1027,25 @@ class MemoryPingEngine:
     # Habit Detection System
     # ------------------------------------------------------------------------
     
-    def _track_habit(self, chat_id: int, message: str, remind_time: datetime):
-        """Track reminder patterns for habit detection"""
-        cid = str(chat_id)
-        if cid not in self.data.habits:
-            self.data.habits[cid] = []
+    def _track_habit(self, chat_id: int, message: str, remind_time: datetime, timestamp: str):
+        """Track reminder patterns for habit detection; timestamp is the reminder's created_at"""
+        if chat_id not in self.data.habits:
+            self.data.habits[chat_id] = deque(maxlen=HABIT_HISTORY)
         
-        self.data.habits[cid].append({
+        self.data.habits[chat_id].append({
             'message': message.lower(),
             'hour': remind_time.hour,
             'weekday': remind_time.weekday(),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         })
-        
-        # Keep only last 100 entries per user
-        self.data.habits[cid] = self.data.habits[cid][-100:]
-        self.data.save_habits()
+        self.data.save_habits(chat_id)
     
     def analyze_habits(self, chat_id: int) -> Optional[List[dict]]:
         """
         Analyze user's reminder patterns and suggest recurring reminders
         Returns list of suggestions or None
         """
-        patterns = self.data.habits.get(str(chat_id), [])
+        patterns = self.data.habits.get(chat_id, [])
         if len(patterns) < 5:
             return None
         
@@ -615,47 +1071,48 @@ class MemoryPingEngine:
     
     def save_mood(self, chat_id: int, mood: str, note: str = ""):
         """Save user's daily mood"""
-        cid = str(chat_id)
-        today = datetime.now().strftime("%Y-%m-%d")
+        now = datetime.now()
+        today = now.date().isoformat()
         
-        if cid not in self.data.moods:
-            self.data.moods[cid] = {}
+        if chat_id not in self.data.moods:
+            self.data.moods[chat_id] = {}
         
-        self.data.moods[cid][today] = {
+        self.data.moods[chat_id][today] = {
             'mood': mood,
             'note': note,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now.isoformat()
         }
-        self.data.save_moods()
+        self.data.save_moods(chat_id)
     
     def get_recent_moods(self, chat_id: int, days: int = 7) -> List[dict]:
         """Get user's mood history for last N days"""
-        cid = str(chat_id)
-        if cid not in self.data.moods:
+        if chat_id not in self.data.moods:
             return []
         
-        moods = self.data.moods[cid]
-        recent = []
-        
-        for i in range(days):
-            date = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-            if date in moods:
-                recent.append({
-                    'date': date,
-                    **moods[date]
-                })
+        today = date.today()
+        first = (today - timedelta(days=days - 1)).isoformat()
+        last = today.isoformat()
         
+        # ISO dates compare correctly as strings; newest first
+        recent = [
+            {'date': day, **mood}
+            for day, mood in self.data.moods[chat_id].items()
+            if first <= day <= last
+        ]
+        recent.sort(key=itemgetter('date'), reverse=True)
         return recent
     
     # ------------------------------------------------------------------------
     # Timezone & Time Utilities
     # ------------------------------------------------------------------------
     
-    def get_user_timezone(self, chat_id: int) -> pytz.timezone:
+    def get_user_timezone(self, chat_id: int) -> ZoneInfo:
         """Get user's timezone"""
-        cid = str(chat_id)
-        tz_name = self.data.user_data.get(cid, {}).get('timezone', 'Asia/Kolkata')
-        return pytz.timezone(tz_name)
+        tz = self._tz_cache.get(chat_id)
+        if tz is None:
+            tz_name = self.data.user_data.get(chat_id, _EMPTY).get('timezone', 'Asia/Kolkata')
+            tz = self._tz_cache[chat_id] = get_timezone(tz_name)
+        return tz
     
     def get_current_time(self, chat_id: int) -> datetime:
         """Get current time in user's timezone"""
@@ -667,14 +1124,9 @@ class MemoryPingEngine:
     
     def get_footer(self) -> str:
         """Get rotating footer with tips/quotes/credits"""
-        self.data.message_count += 1
-        
-        if self.data.message_count % 10 == 0:
-            return "\n\n_✨ MemoryPing v4.0 by Achu Vijayakumar_"
-        elif self.data.message_count % 5 == 0:
-            return f"\n\n💭 _{random.choice(MOTIVATIONAL_QUOTES)}_"
-        else:
-            return f"\n\n{random.choice(TIPS)}"
+        index = self.data.message_count
+        self.data.message_count = (index + 1) % len(FOOTER_CYCLE)
+        return FOOTER_CYCLE[index]
     
     @staticmethod
     def format_progress_bar(percentage: float, length: int = 10) -> str:
@@ -688,18 +1140,22 @@ class MemoryPingEngine:
         if len(text) <= MAX_MESSAGE_LENGTH:
             return [text]
         
+        # Walk indices over the original text so only the chunks are copied
         parts = []
-        while text:
-            if len(text) <= MAX_MESSAGE_LENGTH:
-                parts.append(text)
+        start, end = 0, len(text)
+        while start < end:
+            if end - start <= MAX_MESSAGE_LENGTH:
+                parts.append(text[start:])
                 break
             
-            split_at = text.rfind('\n', 0, MAX_MESSAGE_LENGTH)
+            split_at = text.rfind('\n', start, start + MAX_MESSAGE_LENGTH)
             if split_at == -1:
-                split_at = MAX_MESSAGE_LENGTH
+                split_at = start + MAX_MESSAGE_LENGTH
             
-            parts.append(text[:split_at])
-            text = text[split_at:].lstrip()
+            parts.append(text[start:split_at])
+            start = split_at
+            while start < end and text[start].isspace():
+                start += 1
         
         return parts
 
@@ -716,249 +1172,134 @@ bot_engine = MemoryPingEngine(data_manager)
 
 def parse_time(time_str: str, current_time: datetime) -> Optional[datetime]:
     """
-    Parse natural language time expressions
+    Parse natural language time expressions (lowercase, as parse_input returns them)
     Supports: 5pm, in 30 min, tomorrow, lunch, etc.
     """
-    time_str = time_str.lower().strip()
-    is_tomorrow = "tomorrow" in time_str
-    time_str = time_str.replace("tomorrow", "").strip()
+    spec = parse_time_spec(time_str)
+    if spec is None:
+        return None
     
     # Make timezone-aware
     if current_time.tzinfo is None:
-        current_time = DEFAULT_TIMEZONE.localize(current_time)
-    
-    # Special keywords
-    if "lunch" in time_str:
-        remind_time = current_time.replace(hour=13, minute=0, second=0, microsecond=0)
-        if remind_time <= current_time:
-            remind_time += timedelta(days=1)
-        return remind_time
-    
-    if "dinner" in time_str:
-        remind_time = current_time.replace(hour=19, minute=0, second=0, microsecond=0)
-        if remind_time <= current_time:
-            remind_time += timedelta(days=1)
-        return remind_time
-    
-    if "morning" in time_str:
-        remind_time = current_time.replace(hour=9, minute=0, second=0, microsecond=0)
-        if is_tomorrow or remind_time <= current_time:
-            remind_time += timedelta(days=1)
-        return remind_time
-    
-    if "evening" in time_str:
-        remind_time = current_time.replace(hour=18, minute=0, second=0, microsecond=0)
-        if is_tomorrow or remind_time <= current_time:
-            remind_time += timedelta(days=1)
-        return remind_time
-    
-    # Relative time: "in 2h 30m"
-    match = re.search(
-        r'(?:in|after)\s+(?:(\d+)\s*(?:hours?|hrs?|h))?\s*(?:(\d+)\s*(?:minutes?|mins?|min|m))?',
-        time_str
-    )
-    if match and (match.group(1) or match.group(2)):
-        hours = int(match.group(1)) if match.group(1) else 0
-        minutes = int(match.group(2)) if match.group(2) else 0
-        return current_time + timedelta(hours=hours, minutes=minutes)
-    
-    # 12-hour format: "5pm", "3:30am"
-    match = re.search(r'(?:at\s+)?(\d{1,2})(?::(\d{2}))?\s*(am|pm)', time_str)
-    if match:
-        hour = int(match.group(1))
-        minute = int(match.group(2)) if match.group(2) else 0
-        period = match.group(3)
-        
-        if period == 'pm' and hour != 12:
-            hour += 12
-        elif period == 'am' and hour == 12:
-            hour = 0
-        
-        remind_time = current_time.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        
-        if is_tomorrow or remind_time <= current_time:
-            remind_time += timedelta(days=1)
-        
-        return remind_time
+        current_time = current_time.replace(tzinfo=DEFAULT_TIMEZONE)
     
-    # 24-hour format: "14:30"
-    match = re.search(r'at\s+(\d{1,2}):(\d{2})(?!\s*[ap]m)', time_str)
-    if match:
-        hour = int(match.group(1))
-        minute = int(match.group(2))
-        remind_time = current_time.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        
-        if is_tomorrow or remind_time <= current_time:
-            remind_time += timedelta(days=1)
-        
-        return remind_time
+    if spec[0] == 'in':
+        return current_time + spec[1]
     
-    return None
-
-def extract_task_and_time(text: str) -> Tuple[Optional[str], Optional[str]]:
-    """
-    Extract task and time from natural language
-    Example: "Remind me to call mom at 5pm" -> ("call mom", "at 5pm")
-    """
-    text_lower = text.lower()
-    
-    # Common trigger patterns
-    triggers = [
-        r'remind\s+me\s+to\s+',
-        r'send\s+me\s+(?:a\s+)?',
-        r'tell\s+me\s+(?:to\s+)?',
-        r'ping\s+me\s+(?:about\s+|to\s+)?',
-        r'alert\s+me\s+(?:about\s+|to\s+)?'
-    ]
-    
-    for trigger in triggers:
-        trigger_match = re.search(trigger, text_lower)
-        if trigger_match:
-            after_trigger = text[trigger_match.end():]
-            time_match = re.search(r'\s+(?:at|in|after)\s+', after_trigger.lower())
-            if time_match:
-                task = after_trigger[:time_match.start()].strip()
-                time_str = after_trigger[time_match.start():].strip()
-                return task, time_str
-    
-    # No trigger, just look for time pattern
-    time_match = re.search(r'\s+(?:at|in|after)\s+', text_lower)
-    if time_match:
-        task = text[:time_match.start()].strip()
-        time_str = text[time_match.start():].strip()
-        if task:
-            return task, time_str
-    
-    return None, None
-
-def extract_metadata(text: str) -> Tuple[str, str, str, str, Optional[str], List[str]]:
-    """
-    Extract metadata from reminder text: category, priority, notes, recurring, shared
-    Example: "Meeting #work !high -- Bring laptop" 
-    """
-    category = 'other'
-    priority = 'medium'
-    notes = ''
-    recurring = None
-    shared_with = []
-    
-    # Extract category (#work)
-    cat_match = re.search(r'#(\w+)', text)
-    if cat_match and cat_match.group(1).lower() in CATEGORIES:
-        category = cat_match.group(1).lower()
-        text = text.replace(cat_match.group(0), '')
-    
-    # Extract priority (!high)
-    pri_match = re.search(r'!(high|medium|low)', text, re.IGNORECASE)
-    if pri_match:
-        priority = pri_match.group(1).lower()
-        text = text.replace(pri_match.group(0), '')
-    
-    # Extract notes (-- Note text)
-    notes_match = re.search(r'--\s*(.+?)(?:\s+#|\s+!|$)', text)
-    if notes_match:
-        notes = notes_match.group(1).strip()
-        text = text[:notes_match.start()] + text[notes_match.end():]
-    
-    # Extract recurring patterns
-    if 'every day' in text.lower() or 'daily' in text.lower():
-        recurring = 'daily'
-    elif 'every week' in text.lower() or 'weekly' in text.lower():
-        recurring = 'weekly'
-    elif re.search(r'every\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)', text.lower()):
-        recurring = 'weekly'
-    
-    # Extract shared users (@username)
-    shared_matches = re.findall(r'@(\w+)', text)
-    if shared_matches:
-        shared_with = shared_matches
-        for match in shared_matches:
-            text = text.replace(f'@{match}', '')
-    
-    return text.strip(), category, priority, notes, recurring, shared_with
+    _, hour, minute, push = spec
+    remind_time = current_time.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if push or remind_time <= current_time:
+        remind_time += timedelta(days=1)
+    return remind_time
 
 # ============================================================================
 # COMMAND HANDLERS
 # ============================================================================
 
+# Static replies and keyboards, built once at import rather than on every command
+WELCOME_MESSAGE = (
+    "🧠 *MemoryPing v4.0*\n"
+    "_The Intelligent Companion_\n\n"
+    "I'm your productivity partner with personality, XP system, and smart features!\n\n"
+    "*Quick Start:*\n"
+    "Just talk naturally!\n"
+    "_'Remind me to call mom at 5pm'_\n"
+    "_'Workout in 30 minutes'_\n"
+    "_'Take medicine every day at 9am'_\n\n"
+    "*Features:*\n"
+    "🎭 4 Personalities\n"
+    "🎮 XP & Levels\n"
+    "🧠 Habit Detection\n"
+    "😊 Mood Tracking\n"
+    "🏆 Achievements\n\n"
+    "_Created by Achu Vijayakumar_"
+)
+
+HELP_MESSAGE = (
+    "📖 *MemoryPing v4.0 Guide*\n\n"
+    "*🎯 Commands:*\n"
+    "/personality - Choose bot vibe\n"
+    "/stats - View XP & level\n"
+    "/today - Today's schedule\n"
+    "/list - All reminders\n"
+    "/digest - Daily summary\n"
+    "/reflect - Mood history\n"
+    "/habits - Smart suggestions\n"
+    "/focus - Pomodoro timer\n\n"
+    "*💬 Natural Language:*\n"
+    "• Call mom at 5pm\n"
+    "• Workout in 30 minutes #fitness\n"
+    "• Meeting at 2pm tomorrow #work !high\n"
+    "• Take medicine every day at 9am\n\n"
+    "*🎨 Organize:*\n"
+    "#work #health #fitness #family\n"
+    "!high !medium !low\n"
+    "-- Add notes after dash\n\n"
+    "_by Achu Vijayakumar_"
+)
+
+MAIN_MENU_MARKUP = ReplyKeyboardMarkup([
+    [KeyboardButton("⚡ Quick"), KeyboardButton("📋 List"), KeyboardButton("📊 Stats")],
+    [KeyboardButton("❓ Help")]
+], resize_keyboard=True)
+
+PERSONALITY_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🧘 Zen Monk", callback_data="p:zen")],
+    [InlineKeyboardButton("🏋️ Coach", callback_data="p:coach")],
+    [InlineKeyboardButton("💖 Bestie", callback_data="p:bestie")],
+    [InlineKeyboardButton("🤓 Tech Bro", callback_data="p:techbro")]
+])
+
+MOOD_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("😊 Great", callback_data="m:great")],
+    [InlineKeyboardButton("😐 Okay", callback_data="m:okay")],
+    [InlineKeyboardButton("😞 Rough", callback_data="m:rough")]
+])
+
+QUICK_TEMPLATES_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💊 Take Medicine", callback_data="q:medicine")],
+    [InlineKeyboardButton("💧 Drink Water", callback_data="q:water")],
+    [InlineKeyboardButton("💪 Exercise", callback_data="q:exercise")],
+    [InlineKeyboardButton("🧍 Stand & Stretch", callback_data="q:standup")],
+    [InlineKeyboardButton("📞 Call Family", callback_data="q:call_family")],
+    [InlineKeyboardButton("📧 Check Email", callback_data="q:check_email")]
+])
+
+# "When?" keyboard for each quick template
+TEMPLATE_TIME_MARKUPS = {
+    template_key: InlineKeyboardMarkup([
+        [InlineKeyboardButton("⏰ 15 min", callback_data=f"t:{template_key}:15")],
+        [InlineKeyboardButton("⏰ 30 min", callback_data=f"t:{template_key}:30")],
+        [InlineKeyboardButton("⏰ 1 hour", callback_data=f"t:{template_key}:60")],
+        [InlineKeyboardButton("⏰ 2 hours", callback_data=f"t:{template_key}:120")]
+    ])
+    for template_key in TEMPLATES
+}
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Start command - Welcome message with main menu"""
-    keyboard = [
-        [KeyboardButton("⚡ Quick"), KeyboardButton("📋 List"), KeyboardButton("📊 Stats")],
-        [KeyboardButton("❓ Help")]
-    ]
-    reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
-    
-    welcome = (
-        "🧠 *MemoryPing v4.0*\n"
-        "_The Intelligent Companion_\n\n"
-        "I'm your productivity partner with personality, XP system, and smart features!\n\n"
-        "*Quick Start:*\n"
-        "Just talk naturally!\n"
-        "_'Remind me to call mom at 5pm'_\n"
-        "_'Workout in 30 minutes'_\n"
-        "_'Take medicine every day at 9am'_\n\n"
-        "*Features:*\n"
-        "🎭 4 Personalities\n"
-        "🎮 XP & Levels\n"
-        "🧠 Habit Detection\n"
-        "😊 Mood Tracking\n"
-        "🏆 Achievements\n\n"
-        "_Created by Achu Vijayakumar_"
-    )
-    
-    await update.message.reply_text(welcome, parse_mode='Markdown', reply_markup=reply_markup)
+    await update.message.reply_text(WELCOME_MESSAGE, parse_mode='Markdown', reply_markup=MAIN_MENU_MARKUP)
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Help command - Show all features and commands"""
-    help_text = (
-        "📖 *MemoryPing v4.0 Guide*\n\n"
-        "*🎯 Commands:*\n"
-        "/personality - Choose bot vibe\n"
-        "/stats - View XP & level\n"
-        "/today - Today's schedule\n"
-        "/list - All reminders\n"
-        "/digest - Daily summary\n"
-        "/reflect - Mood history\n"
-        "/habits - Smart suggestions\n"
-        "/focus - Pomodoro timer\n\n"
-        "*💬 Natural Language:*\n"
-        "• Call mom at 5pm\n"
-        "• Workout in 30 minutes #fitness\n"
-        "• Meeting at 2pm tomorrow #work !high\n"
-        "• Take medicine every day at 9am\n\n"
-        "*🎨 Organize:*\n"
-        "#work #health #fitness #family\n"
-        "!high !medium !low\n"
-        "-- Add notes after dash\n\n"
-        "_by Achu Vijayakumar_"
-    )
-    await update.message.reply_text(help_text, parse_mode='Markdown')
+    await update.message.reply_text(HELP_MESSAGE, parse_mode='Markdown')
 
 async def personality_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Personality selection command"""
-    keyboard = [
-        [InlineKeyboardButton("🧘 Zen Monk", callback_data="personality_zen")],
-        [InlineKeyboardButton("🏋️ Coach", callback_data="personality_coach")],
-        [InlineKeyboardButton("💖 Bestie", callback_data="personality_bestie")],
-        [InlineKeyboardButton("🤓 Tech Bro", callback_data="personality_techbro")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
     current = bot_engine.get_user_personality(update.effective_chat.id)
     current_name = PERSONALITIES[current]['name']
     
     await update.message.reply_text(
         f"🎭 *Choose Your Bot's Vibe*\n\nCurrent: {current_name}\n\nSelect a personality:",
         parse_mode='Markdown',
-        reply_markup=reply_markup
+        reply_markup=PERSONALITY_MARKUP
     )
 
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Stats command - Show XP, level, memory score, achievements"""
     chat_id = update.effective_chat.id
     
-    if str(chat_id) not in data_manager.stats:
+    if chat_id not in data_manager.stats:
         await update.message.reply_text(
             "📊 *Start Your Journey!*\n\n"
             "Create your first reminder to begin tracking!\n\n"
@@ -967,7 +1308,7 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
-    stats = data_manager.stats[str(chat_id)]
+    stats = data_manager.stats[chat_id]
     xp = bot_engine.get_user_xp(chat_id)
     level = bot_engine.get_user_level(chat_id)
     memory_score = bot_engine.calculate_memory_score(chat_id)
@@ -975,7 +1316,7 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     created = stats.get('created', 0)
     completed = stats.get('completed', 0)
     snoozed = stats.get('snoozed', 0)
-    completion_rate = (completed / created * 100) if created > 0 else 0
+    completion_rate = bot_engine.get_completion_rate(chat_id)
     
     # XP progress bar
     xp_in_level = xp % XP_PER_LEVEL
@@ -987,10 +1328,11 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     streak_text = f"🔥 Streak: {streak} days\n" if streak > 0 else ""
     
     # Achievements
-    user_achs = data_manager.user_data.get(str(chat_id), {}).get('achievements', [])
+    user_achs = data_manager.user_data.get(chat_id, _EMPTY).get('achievements', set())
     ach_text = ""
     if user_achs:
-        ach_emojis = [ACHIEVEMENTS[a]['name'].split()[0] for a in user_achs[:5]]
+        # Shown in the order achievements are defined
+        ach_emojis = [emoji for a, emoji in ACHIEVEMENT_EMOJI.items() if a in user_achs][:5]
         ach_text = f"\n🏆 Achievements: {' '.join(ach_emojis)}"
     
     message = (
@@ -1012,19 +1354,12 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def today_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show all reminders scheduled for today"""
     chat_id = update.effective_chat.id
-    reminders = bot_engine.get_user_reminders(chat_id)
     
     current_time = bot_engine.get_current_time(chat_id)
     today_start = current_time.replace(hour=0, minute=0, second=0)
     today_end = current_time.replace(hour=23, minute=59, second=59)
     
-    today_reminders = {}
-    for rid, rdata in reminders.items():
-        remind_time = datetime.fromisoformat(rdata['time'])
-        if remind_time.tzinfo is None:
-            remind_time = DEFAULT_TIMEZONE.localize(remind_time)
-        if today_start <= remind_time <= today_end:
-            today_reminders[rid] = (rdata, remind_time)
+    today_reminders = bot_engine.get_reminders_between(chat_id, today_start, today_end)
     
     if not today_reminders:
         await update.message.reply_text(
@@ -1032,26 +1367,21 @@ async def today_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
-    message = f"📅 *Today's Schedule* - {current_time.strftime('%b %d')}\n\n"
+    parts = [f"📅 *Today's Schedule* - {current_time.strftime('%b %d')}\n\n"]
     
-    for idx, (rid, (rdata, rtime)) in enumerate(
-        sorted(today_reminders.items(), key=lambda x: x[1][1]), 1
-    ):
-        cat_emoji = CATEGORIES.get(rdata.get('category', 'other'), '📌')
-        pri_emoji = PRIORITIES.get(rdata.get('priority', 'medium'), '🟡')
-        
-        message += (
-            f"{idx}. {cat_emoji} {pri_emoji} {rdata['message']}\n"
+    for idx, (rid, rdata, rtime) in enumerate(today_reminders, 1):
+        parts.append(
+            f"{idx}. {rdata['cat_emoji']} {rdata['pri_emoji']} {rdata['message']}\n"
             f"   ⏰ {rtime.strftime('%I:%M %p')}\n\n"
         )
     
-    message += bot_engine.get_footer()
-    await update.message.reply_text(message, parse_mode='Markdown')
+    parts.append(bot_engine.get_footer())
+    await update.message.reply_text("".join(parts), parse_mode='Markdown')
 
 async def list_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """List all active reminders with action buttons"""
     chat_id = update.effective_chat.id
-    reminders = bot_engine.get_user_reminders(chat_id)
+    reminders = bot_engine.get_scheduled_reminders(chat_id)
     
     if not reminders:
         await update.message.reply_text(
@@ -1060,38 +1390,33 @@ async def list_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
-    message = "📋 *Your Reminders*\n\n"
+    parts = ["📋 *Your Reminders*\n\n"]
     keyboard = []
     
-    for idx, (rid, rdata) in enumerate(
-        sorted(reminders.items(), key=lambda x: x[1]['time']), 1
-    ):
-        remind_time = datetime.fromisoformat(rdata['time'])
-        cat_emoji = CATEGORIES.get(rdata.get('category', 'other'), '📌')
-        pri_emoji = PRIORITIES.get(rdata.get('priority', 'medium'), '🟡')
+    for idx, (rid, rdata, remind_time) in enumerate(reminders, 1):
         recurring = f" 🔄 {rdata['recurring']}" if rdata.get('recurring') else ""
         
-        message += (
-            f"{idx}. {cat_emoji} {pri_emoji} {rdata['message']}\n"
+        parts.append(
+            f"{idx}. {rdata['cat_emoji']} {rdata['pri_emoji']} {rdata['message']}\n"
             f"   ⏰ {remind_time.strftime('%I:%M %p, %b %d')}{recurring}\n\n"
         )
         
         keyboard.append([
-            InlineKeyboardButton(f"✅ #{idx}", callback_data=f"complete_{rid}"),
-            InlineKeyboardButton(f"❌ #{idx}", callback_data=f"delete_{rid}")
+            InlineKeyboardButton(f"✅ #{idx}", callback_data=f"c:{rdata['short_id']}"),
+            InlineKeyboardButton(f"❌ #{idx}", callback_data=f"d:{rdata['short_id']}")
         ])
     
-    message += bot_engine.get_footer()
+    parts.append(bot_engine.get_footer())
     reply_markup = InlineKeyboardMarkup(keyboard)
     
-    await update.message.reply_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+    await update.message.reply_text("".join(parts), parse_mode='Markdown', reply_markup=reply_markup)
 
 async def digest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Daily digest - Summary of productivity"""
     chat_id = update.effective_chat.id
     current_time = bot_engine.get_current_time(chat_id)
     
-    stats = data_manager.stats.get(str(chat_id), {})
+    stats = data_manager.stats.get(chat_id, _EMPTY)
     reminders = bot_engine.get_user_reminders(chat_id)
     
     # Stats
@@ -1103,19 +1428,10 @@ async def digest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Upcoming in next 24h
     next_24h = current_time + timedelta(hours=24)
-    upcoming = []
-    
-    for rid, rdata in reminders.items():
-        remind_time = datetime.fromisoformat(rdata['time'])
-        if remind_time.tzinfo is None:
-            remind_time = DEFAULT_TIMEZONE.localize(remind_time)
-        if current_time <= remind_time <= next_24h:
-            upcoming.append((rid, rdata, remind_time))
-    
-    upcoming.sort(key=lambda x: x[2])
+    upcoming = bot_engine.get_reminders_between(chat_id, current_time, next_24h)
     
     # Build message
-    message = (
+    parts = [
         f"📊 *Daily Digest* - {current_time.strftime('%B %d, %Y')}\n\n"
         f"⭐ Level {level} | 💎 {xp} XP\n"
         f"🧠 Memory Score: {memory_score}/1000\n\n"
@@ -1123,19 +1439,18 @@ async def digest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"✅ Completed: {completed}\n"
         f"📋 Active: {len(reminders)}\n\n"
         f"*Next 24 Hours:* {len(upcoming)} reminders\n\n"
-    )
+    ]
     
     if upcoming:
         for idx, (rid, rdata, rtime) in enumerate(upcoming[:5], 1):
-            cat_emoji = CATEGORIES.get(rdata.get('category', 'other'), '📌')
-            message += f"{idx}. {cat_emoji} {rdata['message']}\n   ⏰ {rtime.strftime('%I:%M %p')}\n"
+            parts.append(f"{idx}. {rdata['cat_emoji']} {rdata['message']}\n   ⏰ {rtime.strftime('%I:%M %p')}\n")
         
         if len(upcoming) > 5:
-            message += f"\n...and {len(upcoming) - 5} more"
+            parts.append(f"\n...and {len(upcoming) - 5} more")
     
-    message += f"\n\n{bot_engine.get_footer()}"
+    parts.append(f"\n\n{bot_engine.get_footer()}")
     
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text("".join(parts), parse_mode='Markdown')
 
 async def reflect_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show mood history and reflection"""
@@ -1143,21 +1458,14 @@ async def reflect_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     moods = bot_engine.get_recent_moods(chat_id, days=7)
     
     if not moods:
-        keyboard = [
-            [InlineKeyboardButton("😊 Great", callback_data="mood_great")],
-            [InlineKeyboardButton("😐 Okay", callback_data="mood_okay")],
-            [InlineKeyboardButton("😞 Rough", callback_data="mood_rough")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         await update.message.reply_text(
             "😊 *Daily Reflection*\n\nHow was your day today?",
             parse_mode='Markdown',
-            reply_markup=reply_markup
+            reply_markup=MOOD_MARKUP
         )
         return
     
-    message = "😊 *Your Mood History*\n\n"
+    parts = ["😊 *Your Mood History*\n\n"]
     
     mood_emojis = {
         'great': '😊',
@@ -1168,14 +1476,14 @@ async def reflect_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     for mood_data in moods:
         emoji = mood_emojis.get(mood_data['mood'], '😐')
         date = datetime.fromisoformat(mood_data['date']).strftime('%b %d')
-        message += f"{emoji} {date}"
+        parts.append(f"{emoji} {date}")
         if mood_data.get('note'):
-            message += f" - {mood_data['note'][:30]}"
-        message += "\n"
+            parts.append(f" - {mood_data['note'][:30]}")
+        parts.append("\n")
     
-    message += f"\n{bot_engine.get_footer()}"
+    parts.append(f"\n{bot_engine.get_footer()}")
     
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text("".join(parts), parse_mode='Markdown')
 
 async def habits_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show habit suggestions based on patterns"""
@@ -1191,16 +1499,15 @@ async def habits_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
-    message = "🧠 *Smart Habit Suggestions*\n\n"
-    message += "Based on your patterns, consider:\n\n"
+    parts = ["🧠 *Smart Habit Suggestions*\n\nBased on your patterns, consider:\n\n"]
     
     for idx, sug in enumerate(suggestions[:5], 1):
-        message += f"{idx}. {sug['task'].title()}\n   Suggested: {sug['time']} daily\n\n"
+        parts.append(f"{idx}. {sug['task'].title()}\n   Suggested: {sug['time']} daily\n\n")
     
-    message += "_Tap any suggestion to create it!_"
-    message += bot_engine.get_footer()
+    parts.append("_Tap any suggestion to create it!_")
+    parts.append(bot_engine.get_footer())
     
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text("".join(parts), parse_mode='Markdown')
 
 async def focus_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Start a Pomodoro focus session (25 minutes)"""
@@ -1236,48 +1543,37 @@ async def send_focus_complete(context: ContextTypes.DEFAULT_TYPE):
 
 async def quick_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Quick reminder templates"""
-    keyboard = [
-        [InlineKeyboardButton("💊 Take Medicine", callback_data="quick_medicine")],
-        [InlineKeyboardButton("💧 Drink Water", callback_data="quick_water")],
-        [InlineKeyboardButton("💪 Exercise", callback_data="quick_exercise")],
-        [InlineKeyboardButton("🧍 Stand & Stretch", callback_data="quick_standup")],
-        [InlineKeyboardButton("📞 Call Family", callback_data="quick_call_family")],
-        [InlineKeyboardButton("📧 Check Email", callback_data="quick_check_email")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
     await update.message.reply_text(
         "⚡ *Quick Reminder Templates*\n\nPick one and set the time!",
         parse_mode='Markdown',
-        reply_markup=reply_markup
+        reply_markup=QUICK_TEMPLATES_MARKUP
     )
 
 # ============================================================================
 # MESSAGE HANDLER - Natural Language Processing
 # ============================================================================
 
+# Reply keyboard buttons and the handlers they trigger
+BUTTON_HANDLERS = {
+    "⚡ Quick": quick_reminders,
+    "📋 List": list_reminders,
+    "📊 Stats": stats_command,
+    "❓ Help": help_command
+}
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Main message handler - Parse natural language reminders"""
     text = update.message.text
     chat_id = update.effective_chat.id
     
     # Handle button shortcuts
-    button_handlers = {
-        "⚡ Quick": quick_reminders,
-        "📋 List": list_reminders,
-        "📊 Stats": stats_command,
-        "❓ Help": help_command
-    }
-    
-    if text in button_handlers:
-        await button_handlers[text](update, context)
+    button_handler = BUTTON_HANDLERS.get(text)
+    if button_handler:
+        await button_handler(update, context)
         return
     
-    # Extract metadata (category, priority, notes, etc.)
-    cleaned_text, category, priority, notes, recurring, shared_with = extract_metadata(text)
-    
-    # Extract task and time
-    task, time_str = extract_task_and_time(cleaned_text)
+    # Extract metadata (category, priority, notes, etc.), task and time
+    task, time_str, category, priority, notes, recurring, shared_with = parse_input(text, CATEGORIES)
     
     if not task or not time_str:
         await update.message.reply_text(
@@ -1288,8 +1584,9 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
-    # Parse time
-    current_time = bot_engine.get_current_time(chat_id)
+    # Parse time in the user's timezone, looked up once for parsing and display
+    user_tz = bot_engine.get_user_timezone(chat_id)
+    current_time = datetime.now(user_tz)
     remind_time = parse_time(time_str, current_time)
     
     if not remind_time or remind_time <= current_time:
@@ -1300,8 +1597,8 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
-    # Create reminder
-    reminder_id = bot_engine.add_reminder(
+    # Create reminder; the reminder tick sends it when it's due
+    bot_engine.add_reminder(
         chat_id, task, remind_time,
         recurring=recurring,
         category=category,
@@ -1314,18 +1611,6 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     time_ach = bot_engine.check_time_achievements(chat_id, remind_time)
     category_ach = bot_engine.check_category_achievement(chat_id)
     
-    # Schedule reminder
-    delay = (remind_time - current_time).total_seconds()
-    context.job_queue.run_once(
-        send_reminder, delay,
-        data={
-            'reminder_id': reminder_id,
-            'chat_id': chat_id,
-            'message': task,
-            'priority': priority
-        }
-    )
-    
     # Build confirmation message
     time_until = remind_time - current_time
     hours = int(time_until.total_seconds() // 3600)
@@ -1349,8 +1634,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         achievement_text = f"\n\n🎉 *Achievement!* {category_ach['name']}\n+{category_ach['xp']} XP ✨"
     
     # Display time in user's timezone
-    user_tz = bot_engine.get_user_timezone(chat_id)
-    display_time = remind_time.astimezone(user_tz) if remind_time.tzinfo else remind_time
+    display_time = remind_time.astimezone(user_tz)
     
     response = (
         f"✅ *{confirmation}*\n\n"
@@ -1367,304 +1651,275 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # REMINDER DELIVERY
 # ============================================================================
 
-async def send_reminder(context: ContextTypes.DEFAULT_TYPE):
+async def send_reminder(bot, reminder_id: str):
     """Send reminder notification with snooze/complete options"""
-    job_data = context.job.data
-    chat_id = job_data['chat_id']
-    message = job_data['message']
-    priority = job_data.get('priority', 'medium')
-    reminder_id = job_data.get('reminder_id')
+    rdata = data_manager.reminders[reminder_id]
+    chat_id = rdata['chat_id']
+    message = rdata['message']
     
-    pri_emoji = PRIORITIES.get(priority, '🟡')
+    pri_emoji = rdata['pri_emoji']
     ping_msg = bot_engine.get_response_tone(chat_id, "ping")
     
     # Action buttons
+    short_id = rdata['short_id']
     keyboard = [
         [
-            InlineKeyboardButton("⏰ 5min", callback_data=f"snooze_{reminder_id}_5"),
-            InlineKeyboardButton("⏰ 15min", callback_data=f"snooze_{reminder_id}_15"),
-            InlineKeyboardButton("⏰ 1hr", callback_data=f"snooze_{reminder_id}_60")
+            InlineKeyboardButton("⏰ 5min", callback_data=f"s:{short_id}:5"),
+            InlineKeyboardButton("⏰ 15min", callback_data=f"s:{short_id}:15"),
+            InlineKeyboardButton("⏰ 1hr", callback_data=f"s:{short_id}:60")
         ],
         [
-            InlineKeyboardButton("✅ Done", callback_data=f"complete_{reminder_id}"),
-            InlineKeyboardButton("❌ Dismiss", callback_data=f"dismiss_{reminder_id}")
+            InlineKeyboardButton("✅ Done", callback_data=f"c:{short_id}"),
+            InlineKeyboardButton("❌ Dismiss", callback_data=f"x:{short_id}")
         ]
     ]
     reply_markup = InlineKeyboardMarkup(keyboard)
     
     # Handle recurring reminders
-    if reminder_id and reminder_id in data_manager.reminders:
-        rdata = data_manager.reminders[reminder_id]
-        if rdata.get('recurring'):
-            current_time = datetime.fromisoformat(rdata['time'])
-            
-            # Calculate next occurrence
-            if rdata['recurring'] == 'daily':
-                next_time = current_time + timedelta(days=1)
-            elif rdata['recurring'] == 'weekly':
-                next_time = current_time + timedelta(weeks=1)
-            else:
-                next_time = current_time + timedelta(days=1)
-            
-            # Update reminder time
-            data_manager.reminders[reminder_id]['time'] = next_time.isoformat()
-            data_manager.save_reminders()
-            
-            # Schedule next occurrence
-            delay = (next_time - datetime.now()).total_seconds()
-            context.job_queue.run_once(
-                send_reminder, delay,
-                data={
-                    'reminder_id': reminder_id,
-                    'chat_id': chat_id,
-                    'message': message,
-                    'priority': priority
-                }
-            )
+    if rdata.get('recurring'):
+        current_time = data_manager.get_time(reminder_id)
+        
+        # Calculate next occurrence
+        if rdata['recurring'] == 'daily':
+            next_time = current_time + timedelta(days=1)
+        elif rdata['recurring'] == 'weekly':
+            next_time = current_time + timedelta(weeks=1)
+        else:
+            next_time = current_time + timedelta(days=1)
+        
+        # Update reminder time, which also queues the next occurrence
+        data_manager.set_time(reminder_id, next_time)
+        data_manager.save_reminders(reminder_id)
     
     # Send notification
-    await context.bot.send_message(
+    await bot.send_message(
         chat_id=chat_id,
         text=f"🔔 *{ping_msg}* {pri_emoji}\n\n{message}",
         parse_mode='Markdown',
         reply_markup=reply_markup
     )
 
+async def reminder_tick(context: ContextTypes.DEFAULT_TYPE):
+    """Send every reminder that has come due since the last tick"""
+    now = time.time()
+    pending = data_manager.pending
+    while pending and pending[0][0] <= now:
+        timestamp, reminder_id = heapq.heappop(pending)
+        if not data_manager.is_pending(timestamp, reminder_id):
+            continue
+        try:
+            await send_reminder(context.bot, reminder_id)
+        except Exception as e:
+            logger.error(f"Error sending reminder {reminder_id}: {e}")
+
+async def sweep_completed(context: ContextTypes.DEFAULT_TYPE):
+    """Purge old completed reminders so memory and the database stay bounded"""
+    removed = data_manager.gc_reminders(datetime.now())
+    if removed:
+        logger.info(f"🧹 Purged {removed} completed reminders")
+
 # ============================================================================
 # BUTTON CALLBACKS
 # ============================================================================
 
-async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle all inline button callbacks"""
-    query = update.callback_query
-    await query.answer()
+async def personality_callback(query, context: ContextTypes.DEFAULT_TYPE, chat_id: int, personality: str):
+    """Switch the user's bot personality"""
+    if chat_id not in data_manager.user_data:
+        data_manager.user_data[chat_id] = {}
     
-    data = query.data
-    chat_id = query.message.chat_id
+    data_manager.user_data[chat_id]['personality'] = personality
+    data_manager.save_user_data(chat_id)
+    bot_engine.invalidate(chat_id)
     
-    # ------------------------------------------
-    # Personality Selection
-    # ------------------------------------------
-    if data.startswith("personality_"):
-        personality = data.replace("personality_", "")
-        cid = str(chat_id)
-        
-        if cid not in data_manager.user_data:
-            data_manager.user_data[cid] = {}
-        
-        data_manager.user_data[cid]['personality'] = personality
-        data_manager.save_user_data()
-        
-        personality_name = PERSONALITIES[personality]['name']
-        sample = bot_engine.get_response_tone(chat_id, "confirmation")
-        
+    personality_name = PERSONALITIES[personality]['name']
+    sample = bot_engine.get_response_tone(chat_id, "confirmation")
+    
+    await query.edit_message_text(
+        f"✅ *Vibe Updated!*\n\n{personality_name}\n\nSample: _{sample}_",
+        parse_mode='Markdown'
+    )
+
+async def mood_callback(query, context: ContextTypes.DEFAULT_TYPE, chat_id: int, mood: str):
+    """Record today's mood"""
+    bot_engine.save_mood(chat_id, mood)
+    
+    mood_responses = {
+        'great': "😊 Awesome! Keep that energy!",
+        'okay': "😐 Solid. Tomorrow can be better!",
+        'rough': "😞 Hang in there. You've got this! 💪"
+    }
+    
+    await query.edit_message_text(
+        f"{mood_responses[mood]}\n\n_Mood saved for today_",
+        parse_mode='Markdown'
+    )
+
+async def quick_callback(query, context: ContextTypes.DEFAULT_TYPE, chat_id: int, template_key: str):
+    """Ask when a quick template reminder should fire"""
+    if template_key in TEMPLATES:
+        template = TEMPLATES[template_key]
         await query.edit_message_text(
-            f"✅ *Vibe Updated!*\n\n{personality_name}\n\nSample: _{sample}_",
-            parse_mode='Markdown'
+            f"⚡ *{template['text']}*\n\nWhen should I remind you?",
+            parse_mode='Markdown',
+            reply_markup=TEMPLATE_TIME_MARKUPS[template_key]
         )
-        return
+
+async def template_callback(query, context: ContextTypes.DEFAULT_TYPE, chat_id: int, template_key: str, minutes: str):
+    """Create a quick template reminder"""
+    minutes = int(minutes)
+    template = TEMPLATES[template_key]
+    current_time = bot_engine.get_current_time(chat_id)
+    remind_time = current_time + timedelta(minutes=minutes)
     
-    # ------------------------------------------
-    # Mood Tracking
-    # ------------------------------------------
-    if data.startswith("mood_"):
-        mood = data.replace("mood_", "")
-        bot_engine.save_mood(chat_id, mood)
-        
-        mood_responses = {
-            'great': "😊 Awesome! Keep that energy!",
-            'okay': "😐 Solid. Tomorrow can be better!",
-            'rough': "😞 Hang in there. You've got this! 💪"
-        }
+    bot_engine.add_reminder(
+        chat_id, template['text'], remind_time,
+        category=template['category'],
+        priority='medium'
+    )
+    
+    cat_emoji = CATEGORIES.get(template['category'], '📌')
+    await query.edit_message_text(
+        f"✅ *Quick Reminder Set!*\n\n{cat_emoji} {template['text']}\n⏰ In {minutes} minutes",
+        parse_mode='Markdown'
+    )
+
+def own_reminder_id(chat_id: int, short_id: str) -> Optional[str]:
+    """Resolve a button's short id, but only to a reminder owned by the chat that pressed it"""
+    reminder_id = data_manager.short_ids.get(int(short_id))
+    if reminder_id is None or data_manager.reminders[reminder_id]['chat_id'] != chat_id:
+        return None
+    return reminder_id
+
+async def snooze_callback(query, context: ContextTypes.DEFAULT_TYPE, chat_id: int, short_id: str, minutes: str):
+    """Push a reminder back by a few minutes"""
+    reminder_id = own_reminder_id(chat_id, short_id)
+    new_time = bot_engine.snooze_reminder(reminder_id, int(minutes))
+    if new_time:
+        bot_engine.update_stats(chat_id, 'snoozed')
         
         await query.edit_message_text(
-            f"{mood_responses[mood]}\n\n_Mood saved for today_",
+            f"⏰ *Snoozed!*\n\nI'll ping you at {new_time.strftime('%I:%M %p')}",
             parse_mode='Markdown'
         )
-        return
-    
-    # ------------------------------------------
-    # Quick Templates
-    # ------------------------------------------
-    if data.startswith("quick_"):
-        template_key = data.replace("quick_", "")
-        if template_key in TEMPLATES:
-            template = TEMPLATES[template_key]
-            keyboard = [
-                [InlineKeyboardButton("⏰ 15 min", callback_data=f"template_{template_key}_15")],
-                [InlineKeyboardButton("⏰ 30 min", callback_data=f"template_{template_key}_30")],
-                [InlineKeyboardButton("⏰ 1 hour", callback_data=f"template_{template_key}_60")],
-                [InlineKeyboardButton("⏰ 2 hours", callback_data=f"template_{template_key}_120")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await query.edit_message_text(
-                f"⚡ *{template['text']}*\n\nWhen should I remind you?",
-                parse_mode='Markdown',
-                reply_markup=reply_markup
-            )
-        return
+    else:
+        await query.edit_message_text("❌ Couldn't snooze reminder")
+
+async def complete_callback(query, context: ContextTypes.DEFAULT_TYPE, chat_id: int, short_id: str):
+    """Mark a reminder done and award XP"""
+    reminder_id = own_reminder_id(chat_id, short_id)
+    success, achievement, level = bot_engine.complete_reminder(reminder_id)
     
-    # ------------------------------------------
-    # Template Time Selection
-    # ------------------------------------------
-    if data.startswith("template_"):
-        parts = data.split("_")
-        template_key = parts[1]
-        minutes = int(parts[2])
+    if success:
+        completion_msg = bot_engine.get_response_tone(chat_id, "completion")
         
-        template = TEMPLATES[template_key]
-        current_time = datetime.now()
-        remind_time = current_time + timedelta(minutes=minutes)
-        
-        reminder_id = bot_engine.add_reminder(
-            chat_id, template['text'], remind_time,
-            category=template['category'],
-            priority='medium'
-        )
+        achievement_text = ""
+        if achievement:
+            achievement_text = f"\n\n🎉 *{achievement['name']}*\n+{achievement['xp']} XP"
         
-        delay = (remind_time - current_time).total_seconds()
-        if hasattr(context, 'application') and context.application.job_queue:
-            context.application.job_queue.run_once(
-                send_reminder, delay,
-                data={
-                    'reminder_id': reminder_id,
-                    'chat_id': chat_id,
-                    'message': template['text'],
-                    'priority': 'medium'
-                }
-            )
-        
-        cat_emoji = CATEGORIES.get(template['category'], '📌')
         await query.edit_message_text(
-            f"✅ *Quick Reminder Set!*\n\n{cat_emoji} {template['text']}\n⏰ In {minutes} minutes",
+            f"✅ *{completion_msg}*\n\n+{XP_PER_COMPLETION} XP{achievement_text}",
             parse_mode='Markdown'
         )
-        return
-    
-    # ------------------------------------------
-    # Snooze Reminder
-    # ------------------------------------------
-    if data.startswith("snooze_"):
-        parts = data.split("_")
-        reminder_id = "_".join(parts[1:-1])
-        minutes = int(parts[-1])
-        
-        new_time = bot_engine.snooze_reminder(reminder_id, minutes)
-        if new_time:
-            bot_engine.update_stats(chat_id, 'snoozed')
-            
-            delay = (new_time - datetime.now()).total_seconds()
-            if reminder_id in data_manager.reminders:
-                rdata = data_manager.reminders[reminder_id]
-                if hasattr(context, 'application') and context.application.job_queue:
-                    context.application.job_queue.run_once(
-                        send_reminder, delay,
-                        data={
-                            'reminder_id': reminder_id,
-                            'chat_id': chat_id,
-                            'message': rdata['message'],
-                            'priority': rdata.get('priority', 'medium')
-                        }
-                    )
-            
-            await query.edit_message_text(
-                f"⏰ *Snoozed!*\n\nI'll ping you at {new_time.strftime('%I:%M %p')}",
-                parse_mode='Markdown'
-            )
-        else:
-            await query.edit_message_text("❌ Couldn't snooze reminder")
-        return
-    
-    # ------------------------------------------
-    # Complete Reminder
-    # ------------------------------------------
-    if data.startswith("complete_"):
-        reminder_id = data.replace("complete_", "")
-        success, achievement, level = bot_engine.complete_reminder(reminder_id)
-        
-        if success:
-            completion_msg = bot_engine.get_response_tone(chat_id, "completion")
-            
-            achievement_text = ""
-            if achievement:
-                achievement_text = f"\n\n🎉 *{achievement['name']}*\n+{achievement['xp']} XP"
-            
-            await query.edit_message_text(
-                f"✅ *{completion_msg}*\n\n+{XP_PER_COMPLETION} XP{achievement_text}",
-                parse_mode='Markdown'
-            )
-        else:
-            await query.edit_message_text("❌ Reminder not found")
-        return
-    
-    # ------------------------------------------
-    # Delete Reminder
-    # ------------------------------------------
-    if data.startswith("delete_"):
-        reminder_id = data.replace("delete_", "")
-        if bot_engine.delete_reminder(reminder_id):
-            await query.edit_message_text("🗑️ *Deleted!*", parse_mode='Markdown')
-        else:
-            await query.edit_message_text("❌ Reminder not found")
-        return
+    else:
+        await query.edit_message_text("❌ Reminder not found")
+
+async def delete_callback(query, context: ContextTypes.DEFAULT_TYPE, chat_id: int, short_id: str):
+    """Delete a reminder from the /list view"""
+    reminder_id = own_reminder_id(chat_id, short_id)
+    if bot_engine.delete_reminder(reminder_id):
+        await query.edit_message_text("🗑️ *Deleted!*", parse_mode='Markdown')
+    else:
+        await query.edit_message_text("❌ Reminder not found")
+
+async def dismiss_callback(query, context: ContextTypes.DEFAULT_TYPE, chat_id: int, short_id: str):
+    """Dismiss a delivered reminder"""
+    bot_engine.delete_reminder(own_reminder_id(chat_id, short_id))
+    await query.edit_message_text("👋 *Dismissed*", parse_mode='Markdown')
+
+# Callback data is "<action>:<arg>[:<arg>]"; the action picks the handler
+CALLBACK_HANDLERS = {
+    "p": personality_callback,
+    "m": mood_callback,
+    "q": quick_callback,
+    "t": template_callback,
+    "s": snooze_callback,
+    "c": complete_callback,
+    "d": delete_callback,
+    "x": dismiss_callback
+}
+
+async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle all inline button callbacks"""
+    query = update.callback_query
+    await query.answer()
     
-    # ------------------------------------------
-    # Dismiss Reminder
-    # ------------------------------------------
-    if data.startswith("dismiss_"):
-        reminder_id = data.replace("dismiss_", "")
-        bot_engine.delete_reminder(reminder_id)
-        await query.edit_message_text("👋 *Dismissed*", parse_mode='Markdown')
-        return
+    action, *args = query.data.split(":")
+    handler = CALLBACK_HANDLERS.get(action)
+    if handler:
+        await handler(query, context, query.message.chat_id, *args)
+    else:
+        # Buttons sent before the current callback format (e.g. "snooze_<id>_<minutes>") land here
+        await query.edit_message_text("⌛ This button has expired")
 
 # ============================================================================
 # BOT INITIALIZATION
 # ============================================================================
 
 async def reschedule_reminders(application):
-    """Reschedule all pending reminders on bot restart"""
-    current_time = datetime.now()
-    rescheduled = 0
+    """Drop reminders that expired while the bot was down and start the reminder tick"""
+    now = time.time()
+    pending = data_manager.pending
     expired = 0
     
     logger.info("🔄 Rescheduling reminders...")
     
-    for reminder_id, rdata in list(data_manager.reminders.items()):
-        if rdata.get('completed'):
+    # Everything due by now pops off the front of the heap
+    while pending and pending[0][0] <= now:
+        timestamp, reminder_id = heapq.heappop(pending)
+        if not data_manager.is_pending(timestamp, reminder_id):
             continue
-        
-        try:
-            remind_time = datetime.fromisoformat(rdata['time'])
-            
-            # Make timezone-aware if needed
-            if remind_time.tzinfo is None:
-                remind_time = DEFAULT_TIMEZONE.localize(remind_time)
-            
-            if remind_time > current_time:
-                delay = (remind_time - current_time).total_seconds()
-                application.job_queue.run_once(
-                    send_reminder,
-                    delay,
-                    data={
-                        'reminder_id': reminder_id,
-                        'chat_id': rdata['chat_id'],
-                        'message': rdata['message'],
-                        'priority': rdata.get('priority', 'medium')
-                    }
-                )
-                rescheduled += 1
-            else:
-                # Delete expired non-recurring reminders
-                if not rdata.get('recurring'):
-                    bot_engine.delete_reminder(reminder_id)
-                    expired += 1
-        
-        except Exception as e:
-            logger.error(f"Error rescheduling reminder {reminder_id}: {e}")
-    
-    logger.info(f"✅ Rescheduled {rescheduled} reminders")
+        # Delete expired non-recurring reminders
+        if not data_manager.reminders[reminder_id].get('recurring'):
+            bot_engine.delete_reminder(reminder_id)
+            expired += 1
+    
+    # The rest are in the future; drop stale entries left by snoozes and deletes
+    pending[:] = [entry for entry in pending if data_manager.is_pending(*entry)]
+    heapq.heapify(pending)
+    
+    # One repeating job sends whatever is due, instead of a timer per reminder.
+    # The job queue keeps its jobs across an auto-restart, so only add them the first time.
+    if not application.job_queue.get_jobs_by_name(reminder_tick.__name__):
+        application.job_queue.run_repeating(reminder_tick, interval=REMINDER_TICK_INTERVAL, first=REMINDER_TICK_INTERVAL)
+        application.job_queue.run_repeating(sweep_completed, interval=REMINDER_GC_INTERVAL, first=0)
+    
+    logger.info(f"✅ Rescheduled {len(pending)} reminders")
     logger.info(f"🗑️ Cleaned up {expired} expired reminders")
 
+async def post_init(application):
+    """Start the keep-alive server and data flusher on the bot's event loop, then reschedule reminders"""
+    # Tasks run synchronously until their first await instead of waiting a loop iteration (Python 3.12+)
+    if hasattr(asyncio, 'eager_task_factory'):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    if KEEP_ALIVE_AVAILABLE:
+        application.bot_data['keep_alive'] = await keep_alive()
+    application.bot_data['flusher'] = asyncio.create_task(data_manager.run_flusher())
+    await reschedule_reminders(application)
+
+async def post_shutdown(application):
+    """Stop the keep-alive server so a restart can bind the port again, and write pending data"""
+    runner = application.bot_data.pop('keep_alive', None)
+    if runner:
+        await runner.cleanup()
+    flusher = application.bot_data.pop('flusher', None)
+    if flusher:
+        flusher.cancel()
+    data_manager.flush()
+
+async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
+    """Log errors raised by handlers and jobs; polling keeps running, so no restart is needed"""
+    logger.error(f"❌ Handler error: {context.error}", exc_info=context.error)
+
 def main():
     """Initialize and run MemoryPing v4.0"""
     
@@ -1685,7 +1940,11 @@ def main():
     logger.info(f"🔑 Bot token loaded: {TOKEN[:10]}...{TOKEN[-5:]}")
     
     try:
-        # Build application with extended timeouts
+        # Run on libuv's event loop where available (not on Windows); run_polling picks up the policy
+        if uvloop:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        
+        # Build application with extended timeouts; updates are handled concurrently
         application = (
             Application.builder()
             .token(TOKEN)
@@ -1693,6 +1952,8 @@ def main():
             .read_timeout(30.0)
             .write_timeout(30.0)
             .pool_timeout(30.0)
+            .get_updates_pool_timeout(30.0)
+            .concurrent_updates(True)
             .build()
         )
         
@@ -1714,9 +1975,11 @@ def main():
         # Message and callback handlers
         application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
         application.add_handler(CallbackQueryHandler(button_callback))
+        application.add_error_handler(error_handler)
         
-        # Set post-init hook for rescheduling reminders
-        application.post_init = reschedule_reminders
+        # Lifecycle hooks: keep-alive server and reminder rescheduling
+        application.post_init = post_init
+        application.post_shutdown = post_shutdown
         
         # ================================================
         # Startup Banner
@@ -1749,36 +2012,44 @@ def main():
         logger.info("  • Bestie 💖")
         logger.info("  • Tech Bro 🤓")
         logger.info("")
-        logger.info("📊 Data Files:")
-        logger.info(f"  • Reminders: {REMINDERS_FILE}")
-        logger.info(f"  • User Data: {USER_DATA_FILE}")
-        logger.info(f"  • Statistics: {STATS_FILE}")
-        logger.info(f"  • Habits: {HABITS_FILE}")
-        logger.info(f"  • Moods: {MOODS_FILE}")
+        logger.info(f"📊 Database: {DB_FILE}")
         logger.info("")
         logger.info("🎯 Bot is ready to serve!")
-        logger.info("🌐 Using external keep-alive (recommended: UptimeRobot)")
+        logger.info("🌐 Keep-alive server shares the bot's event loop (ping /health with UptimeRobot)")
         logger.info("=" * 60 + "\n")
         
         # ================================================
         # Run with Auto-Restart on Errors
         # ================================================
+        # Handler errors go to error_handler inside the running loop; only failures
+        # that stop polling itself (e.g. startup network errors) reach the restart path
+        restart_delay = RESTART_DELAY
         while True:
             try:
                 logger.info("🚀 Starting polling...")
+                # Long-poll for the full 20s so an idle bot makes few getUpdates calls
                 application.run_polling(
                     allowed_updates=Update.ALL_TYPES,
                     drop_pending_updates=True,
-                    pool_timeout=30
+                    timeout=20,
+                    poll_interval=0.0
                 )
+                # run_polling handles Ctrl+C and SIGTERM itself and returns once the bot has shut down
+                logger.info("\n🛑 Bot stopped")
+                logger.info("👋 Goodbye!")
+                break
             except KeyboardInterrupt:
                 logger.info("\n🛑 Bot stopped by user (Ctrl+C)")
                 logger.info("👋 Goodbye!")
                 break
             except Exception as e:
                 logger.error(f"❌ Bot error: {e}")
-                logger.error("🔄 Auto-restarting in 5 seconds...")
-                asyncio.run(asyncio.sleep(5))
+                logger.error(f"🔄 Auto-restarting in {restart_delay} seconds...")
+                # Nothing is running between attempts, so a plain sleep is enough; back off on repeated failures
+                time.sleep(restart_delay)
+                restart_delay = min(MAX_RESTART_DELAY, restart_delay * 2)
+                # run_polling closed its event loop on the way out; the next attempt needs a fresh one
+                asyncio.set_event_loop(asyncio.new_event_loop())
                 logger.info("♻️ Restarting bot...")
                 continue
     
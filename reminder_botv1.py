@@ -1,129 +1,348 @@
 import os
-import json
+import orjson
+import sqlite3
 import asyncio
+import atexit
+import heapq
+import time
 from datetime import datetime, timedelta
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters
 import re
 
-# File to store reminders persistently
+# Database to store reminders persistently
+REMINDERS_DB = "reminders.db"
+# Old JSON store, imported into the database on first run
 REMINDERS_FILE = "reminders.json"
+# Reminders shown per /list page
+LIST_PAGE_SIZE = 10
+# Writes are grouped into one commit at most this often (seconds)
+FLUSH_DELAY = 1.0
+
+# Matches: in 30 minutes, in 30 mins, in 30min, after 2 hours, in 1 hour 30 minutes, etc.
+IN_PATTERN = re.compile(r'(?:in|after)\s+(?:(\d+)\s*(?:hours?|hrs?|h)\s*)?(?:(\d+)\s*(?:minutes?|mins?|min|m))?')
+
+# Matches: at 17:30, at 5:30pm, at 9am (a bare "at 5" is not a time)
+AT_PATTERN = re.compile(r'at\s+(\d{1,2})(?=:|\s*[ap]m)(?::(\d{2}))?\s*(am|pm)?')
+
+# Common trigger phrases for reminders (more casual variations), as one
+# alternation so a message is scanned once and the earliest trigger wins
+TRIGGER_PATTERN = re.compile(
+    r'remind\s+me\s+to\s+'
+    r'|send\s+me\s+(?:a\s+)?'
+    r'|tell\s+me\s+(?:to\s+)?'
+    r'|ping\s+me\s+(?:about\s+|to\s+)?'
+    r'|alert\s+me\s+(?:about\s+|to\s+)?'
+    r'|remember\s+(?:to\s+)?'
+    r'|notify\s+me\s+(?:about\s+|to\s+)?'
+)
+
+# Time indicator (at, in, after)
+TIME_PATTERN = re.compile(r'\s+(?:at|in|after)\s+')
+
+# Pending reminders as a heap of (fire timestamp, reminder_id), drained by
+# a single scheduler_loop task instead of one job per reminder
+reminder_heap = []
+heap_changed = asyncio.Event()
 
 class ReminderBot:
     def __init__(self):
-        self.reminders = self.load_reminders()
+        self.db = self.connect()
+        self.flush_handle = None
+        atexit.register(self.flush)
+    
+    def connect(self):
+        """Open the reminders database, creating it on first run"""
+        db = sqlite3.connect(REMINDERS_DB, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        # AUTOINCREMENT ids are never reused, so a stale Delete button
+        # can't hit a newer reminder
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS reminders ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, chat_id INTEGER, message TEXT, remind_ts REAL)"
+        )
+        # Per-user lookups (/list) walk only that user's rows, already in time order
+        db.execute("CREATE INDEX IF NOT EXISTS idx_reminders_chat ON reminders(chat_id, remind_ts)")
+        if db.execute("PRAGMA user_version").fetchone()[0] == 0:
+            # Import and version bump commit together, so a crash mid-import is retried
+            db.execute("BEGIN")
+            self.import_reminders(db)
+            db.execute("PRAGMA user_version = 1")
+            db.execute("COMMIT")
+        return db
+    
+    def import_reminders(self, db):
+        """Import reminders from the old JSON file"""
+        if not os.path.exists(REMINDERS_FILE):
+            return
+        try:
+            with open(REMINDERS_FILE, 'rb') as f:
+                reminders = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError) as e:
+            print(f"⚠️ Could not import {REMINDERS_FILE}: {e}")
+            return
+        db.executemany(
+            "INSERT INTO reminders (chat_id, message, remind_ts) VALUES (?, ?, ?)",
+            [
+                (r['chat_id'], r['message'], datetime.fromisoformat(r['time']).timestamp())
+                for r in reminders.values()
+                if not r.get('completed')
+            ]
+        )
     
-    def load_reminders(self):
-        """Load reminders from file"""
-        if os.path.exists(REMINDERS_FILE):
+    def write(self, sql, params):
+        """Run a mutation inside the open transaction and schedule its commit"""
+        if not self.db.in_transaction:
+            self.db.execute("BEGIN")
+        cursor = self.db.execute(sql, params)
+        if self.flush_handle is None:
             try:
-                with open(REMINDERS_FILE, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def save_reminders(self):
-        """Save reminders to file"""
-        with open(REMINDERS_FILE, 'w') as f:
-            json.dump(self.reminders, f)
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+            else:
+                self.flush_handle = loop.call_later(FLUSH_DELAY, self.flush)
+        return cursor
+    
+    def flush(self):
+        """Commit every write made since the last flush"""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if self.db.in_transaction:
+            self.db.commit()
+    
+    @staticmethod
+    def to_dict(rows):
+        """Convert database rows to {reminder_id: reminder}"""
+        return {
+            reminder_id: {
+                'chat_id': chat_id,
+                'message': message,
+                'time': datetime.fromtimestamp(remind_ts)
+            }
+            for reminder_id, chat_id, message, remind_ts in rows
+        }
     
     def add_reminder(self, chat_id, message, remind_time):
         """Add a new reminder"""
-        reminder_id = f"{chat_id}_{remind_time.timestamp()}"
-        self.reminders[reminder_id] = {
-            'chat_id': chat_id,
-            'message': message,
-            'time': remind_time.isoformat()
-        }
-        self.save_reminders()
-        return reminder_id
-    
-    def get_user_reminders(self, chat_id):
-        """Get all reminders for a user"""
-        return {k: v for k, v in self.reminders.items() if v['chat_id'] == chat_id}
+        cursor = self.write(
+            "INSERT INTO reminders (chat_id, message, remind_ts) VALUES (?, ?, ?)",
+            (chat_id, message, remind_time.timestamp())
+        )
+        return cursor.lastrowid
+    
+    def get_reminder(self, reminder_id):
+        """Get a single reminder, or None if it was deleted"""
+        return self.to_dict(self.db.execute(
+            "SELECT id, chat_id, message, remind_ts FROM reminders WHERE id = ?",
+            (reminder_id,)
+        )).get(reminder_id)
+    
+    def get_all_reminders(self):
+        """Get every stored reminder"""
+        return self.to_dict(self.db.execute(
+            "SELECT id, chat_id, message, remind_ts FROM reminders"
+        ))
+    
+    def get_user_reminders(self, chat_id, limit=-1, offset=0):
+        """Get a user's reminders in time order, optionally one page of them"""
+        return self.to_dict(self.db.execute(
+            "SELECT id, chat_id, message, remind_ts FROM reminders WHERE chat_id = ? "
+            "ORDER BY remind_ts LIMIT ? OFFSET ?",
+            (chat_id, limit, offset)
+        ))
     
     def delete_reminder(self, reminder_id):
         """Delete a reminder"""
-        if reminder_id in self.reminders:
-            del self.reminders[reminder_id]
-            self.save_reminders()
-            return True
-        return False
+        cursor = self.write("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+        return cursor.rowcount > 0
 
 bot_instance = ReminderBot()
 
+# Reply texts are built once at import; templates are filled with str.format
+WELCOME_MESSAGE = (
+    "🔔 *Welcome to MemoryPing!*\n\n"
+    "I'll help you remember important things!\n\n"
+    "*How to use:*\n"
+    "Just talk naturally! I understand casual language.\n\n"
+    "*Examples:*\n"
+    "• Remind me to call mom at 5:30pm\n"
+    "• Send me a hey in 2 minutes\n"
+    "• Tell me to take medicine at 2pm\n"
+    "• Ping me about meeting in 1 hour\n"
+    "• Remember to workout at 6am tomorrow\n\n"
+    "*Commands:*\n"
+    "/start - Show this message\n"
+    "/list - View all your reminders\n"
+    "/help - Get help\n\n"
+    "_Created by Achu Vijayakumar_ ✨"
+)
+
+HELP_TEXT = (
+    "🔔 *MemoryPing Help*\n\n"
+    "*I understand natural language!*\n"
+    "Just talk to me like you would to a friend.\n\n"
+    "*Supported time formats:*\n"
+    "• `at 5:30pm` or `at 17:30`\n"
+    "• `at 9am tomorrow`\n"
+    "• `in 30 minutes` or `in 30 mins`\n"
+    "• `in 2 hours`\n"
+    "• `in 1 hour 30 minutes`\n"
+    "• `after 5 mins`\n\n"
+    "*Ways to ask:*\n"
+    "• Remind me to...\n"
+    "• Send me...\n"
+    "• Tell me...\n"
+    "• Ping me...\n"
+    "• Remember...\n"
+    "• Alert me...\n\n"
+    "*Examples:*\n"
+    "• Send me a hey in 5 minutes\n"
+    "• Remind me to buy groceries at 6pm\n"
+    "• Tell me to call John after 1 hour\n"
+    "• Ping me about meeting at 2:30pm tomorrow\n\n"
+    "_Created by Achu Vijayakumar_ ✨"
+)
+
+NO_REMINDERS_TEXT = "📭 You have no active reminders.\n\n_Created by Achu Vijayakumar_ ✨"
+
+ERR_NO_PARSE = (
+    "❌ I couldn't understand that.\n\n"
+    "Try something like:\n"
+    "• Remind me to call mom at 5pm\n"
+    "• Send me a hey in 2 minutes\n"
+    "• Tell me to workout at 6am tomorrow\n\n"
+    "_Created by Achu Vijayakumar_ ✨"
+)
+
+ERR_NO_TIME = (
+    "❌ I couldn't understand that time format.\n\n"
+    "Try formats like:\n"
+    "• at 5:30pm\n"
+    "• in 30 minutes\n"
+    "• at 14:00 tomorrow\n"
+    "• after 2 hours\n\n"
+    "_Created by Achu Vijayakumar_ ✨"
+)
+
+ERR_PAST = (
+    "❌ That time is in the past!\n\n"
+    "_Created by Achu Vijayakumar_ ✨"
+)
+
+ACK_TEMPLATE = (
+    "✅ *Got it!*\n\n"
+    "📝 I'll remind you: {task}\n"
+    "⏰ At: {when}\n"
+    "⏳ In: {delta}\n\n"
+    "_Created by Achu Vijayakumar_ ✨"
+)
+
+PING_TEMPLATE = "🔔 *PING!*\n\n{message}\n\n_Created by Achu Vijayakumar_ ✨"
+
+DELETED_TEXT = "✅ Reminder deleted successfully!\n\n_Created by Achu Vijayakumar_ ✨"
+
+NOT_FOUND_TEXT = "❌ Reminder not found!\n\n_Created by Achu Vijayakumar_ ✨"
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Send a message when the command /start is issued."""
-    welcome_message = (
-        "🔔 *Welcome to MemoryPing!*\n\n"
-        "I'll help you remember important things!\n\n"
-        "*How to use:*\n"
-        "Just talk naturally! I understand casual language.\n\n"
-        "*Examples:*\n"
-        "• Remind me to call mom at 5:30pm\n"
-        "• Send me a hey in 2 minutes\n"
-        "• Tell me to take medicine at 2pm\n"
-        "• Ping me about meeting in 1 hour\n"
-        "• Remember to workout at 6am tomorrow\n\n"
-        "*Commands:*\n"
-        "/start - Show this message\n"
-        "/list - View all your reminders\n"
-        "/help - Get help\n\n"
-        "_Created by Achu Vijayakumar_ ✨"
-    )
-    await update.message.reply_text(welcome_message, parse_mode='Markdown')
+    await update.message.reply_text(WELCOME_MESSAGE, parse_mode='Markdown')
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Send a message when the command /help is issued."""
-    help_text = (
-        "🔔 *MemoryPing Help*\n\n"
-        "*I understand natural language!*\n"
-        "Just talk to me like you would to a friend.\n\n"
-        "*Supported time formats:*\n"
-        "• `at 5:30pm` or `at 17:30`\n"
-        "• `at 9am tomorrow`\n"
-        "• `in 30 minutes` or `in 30 mins`\n"
-        "• `in 2 hours`\n"
-        "• `in 1 hour 30 minutes`\n"
-        "• `after 5 mins`\n\n"
-        "*Ways to ask:*\n"
-        "• Remind me to...\n"
-        "• Send me...\n"
-        "• Tell me...\n"
-        "• Ping me...\n"
-        "• Remember...\n"
-        "• Alert me...\n\n"
-        "*Examples:*\n"
-        "• Send me a hey in 5 minutes\n"
-        "• Remind me to buy groceries at 6pm\n"
-        "• Tell me to call John after 1 hour\n"
-        "• Ping me about meeting at 2:30pm tomorrow\n\n"
-        "_Created by Achu Vijayakumar_ ✨"
-    )
-    await update.message.reply_text(help_text, parse_mode='Markdown')
+    await update.message.reply_text(HELP_TEXT, parse_mode='Markdown')
 
-async def list_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """List all reminders for the user"""
-    chat_id = update.effective_chat.id
-    reminders = bot_instance.get_user_reminders(chat_id)
-    
+def build_reminder_page(chat_id, page):
+    """Build the text and keyboard for one page of a user's reminders, or None if there are none"""
+    # One extra row tells us whether a next page exists
+    reminders = bot_instance.get_user_reminders(chat_id, LIST_PAGE_SIZE + 1, page * LIST_PAGE_SIZE)
     if not reminders:
-        await update.message.reply_text("📭 You have no active reminders.\n\n_Created by Achu Vijayakumar_ ✨", parse_mode='Markdown')
-        return
+        return None
     
     message = "📋 *Your Reminders:*\n\n"
     keyboard = []
     
-    for idx, (reminder_id, reminder) in enumerate(sorted(reminders.items(), key=lambda x: x[1]['time']), 1):
-        remind_time = datetime.fromisoformat(reminder['time'])
+    # Rows come back in time order from the (chat_id, remind_ts) index
+    rows = list(reminders.items())[:LIST_PAGE_SIZE]
+    for idx, (reminder_id, reminder) in enumerate(rows, page * LIST_PAGE_SIZE + 1):
+        remind_time = reminder['time']
         message += f"{idx}. {reminder['message']}\n   ⏰ {remind_time.strftime('%I:%M %p, %b %d')}\n\n"
         keyboard.append([InlineKeyboardButton(f"❌ Delete #{idx}", callback_data=f"delete_{reminder_id}")])
     
+    navigation = []
+    if page > 0:
+        navigation.append(InlineKeyboardButton("« Prev", callback_data=f"list_page_{page - 1}"))
+    if len(reminders) > LIST_PAGE_SIZE:
+        navigation.append(InlineKeyboardButton("Next »", callback_data=f"list_page_{page + 1}"))
+    if navigation:
+        keyboard.append(navigation)
+    
     message += "_Created by Achu Vijayakumar_ ✨"
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    return message, InlineKeyboardMarkup(keyboard)
+
+async def list_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """List the user's reminders, one page at a time"""
+    listing = build_reminder_page(update.effective_chat.id, 0)
+    
+    if not listing:
+        await update.message.reply_text(NO_REMINDERS_TEXT, parse_mode='Markdown')
+        return
+    
+    message, reply_markup = listing
     await update.message.reply_text(message, parse_mode='Markdown', reply_markup=reply_markup)
 
+def scan_number(s, i):
+    """Read the decimal number starting at s[i], returning (value, end) or (None, i)"""
+    j = i
+    while j < len(s) and s[j].isdecimal():
+        j += 1
+    return (int(s[i:j]), j) if j > i else (None, i)
+
+def skip_spaces(s, i):
+    """Return the index of the first non-space character at or after s[i]"""
+    while i < len(s) and s[i].isspace():
+        i += 1
+    return i
+
+def parse_in(time_str):
+    """Fast path for "in/after X hours Y minutes" without the regex engine.
+    
+    Accepts exactly what IN_PATTERN accepts at the start of the string and
+    returns a timedelta, or None so the caller falls back to the regexes.
+    """
+    if time_str.startswith('in'):
+        i = 2
+    elif time_str.startswith('after'):
+        i = 5
+    else:
+        return None
+    if i == len(time_str) or not time_str[i].isspace():
+        return None
+    i = skip_spaces(time_str, i)
+    
+    hours = None
+    number, i = scan_number(time_str, i)
+    if number is None:
+        return None
+    i = skip_spaces(time_str, i)
+    if time_str.startswith('h', i):
+        hours = number
+        for unit in ('hours', 'hour', 'hrs', 'hr', 'h'):
+            if time_str.startswith(unit, i):
+                i = skip_spaces(time_str, i + len(unit))
+                break
+        number, i = scan_number(time_str, i)
+        if number is None:
+            return timedelta(hours=hours)
+        i = skip_spaces(time_str, i)
+    if time_str.startswith('m', i):
+        return timedelta(hours=hours or 0, minutes=number)
+    if hours is None:
+        return None
+    return timedelta(hours=hours)
+
 def parse_time(time_str, current_time):
     """Parse various time formats"""
     time_str = time_str.lower().strip()
@@ -132,37 +351,22 @@ def parse_time(time_str, current_time):
     is_tomorrow = "tomorrow" in time_str
     time_str = time_str.replace("tomorrow", "").strip()
     
-    # Parse "in/after X minutes/hours" format - supports variations
-    # Matches: in 30 minutes, in 30 mins, in 30min, after 2 hours, in 1 hour 30 minutes, etc.
-    in_pattern = r'(?:in|after)\s+(?:(\d+)\s*(?:hours?|hrs?|h)\s*)?(?:(\d+)\s*(?:minutes?|mins?|min|m))?'
-    in_match = re.search(in_pattern, time_str)
+    # Parse "in/after X minutes/hours" format, scanning by hand when it leads
+    delta = parse_in(time_str)
+    if delta is not None:
+        return current_time + delta
+    in_match = IN_PATTERN.search(time_str)
     if in_match and (in_match.group(1) or in_match.group(2)):
         hours = int(in_match.group(1)) if in_match.group(1) else 0
         minutes = int(in_match.group(2)) if in_match.group(2) else 0
         return current_time + timedelta(hours=hours, minutes=minutes)
     
-    # Parse "at HH:MM" format (24-hour)
-    at_pattern = r'at\s+(\d{1,2}):(\d{2})'
-    at_match = re.search(at_pattern, time_str)
+    # Parse "at HH:MM", "at H:MMam/pm" or "at Ham/pm" format
+    at_match = AT_PATTERN.search(time_str)
     if at_match:
         hour = int(at_match.group(1))
-        minute = int(at_match.group(2))
-        remind_time = current_time.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        
-        if is_tomorrow:
-            remind_time += timedelta(days=1)
-        elif remind_time <= current_time:
-            remind_time += timedelta(days=1)
-        
-        return remind_time
-    
-    # Parse "at H:MMam/pm" or "at Ham/pm" format
-    at_pattern_ampm = r'at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)'
-    at_match_ampm = re.search(at_pattern_ampm, time_str)
-    if at_match_ampm:
-        hour = int(at_match_ampm.group(1))
-        minute = int(at_match_ampm.group(2)) if at_match_ampm.group(2) else 0
-        period = at_match_ampm.group(3)
+        minute = int(at_match.group(2)) if at_match.group(2) else 0
+        period = at_match.group(3)
         
         if period == 'pm' and hour != 12:
             hour += 12
@@ -185,48 +389,25 @@ def extract_task_and_time(text):
     text = text.strip()
     text_lower = text.lower()
     
-    # Common trigger phrases for reminders (more casual variations)
-    trigger_patterns = [
-        r'remind\s+me\s+to\s+',
-        r'send\s+me\s+(?:a\s+)?',
-        r'tell\s+me\s+(?:to\s+)?',
-        r'ping\s+me\s+(?:about\s+|to\s+)?',
-        r'alert\s+me\s+(?:about\s+|to\s+)?',
-        r'remember\s+(?:to\s+)?',
-        r'notify\s+me\s+(?:about\s+|to\s+)?',
-    ]
-    
-    # Time indicator patterns (at, in, after)
-    time_patterns = [
-        r'\s+(?:at|in|after)\s+',
-    ]
-    
     # Try to find trigger and time indicator
-    for trigger in trigger_patterns:
-        trigger_match = re.search(trigger, text_lower)
-        if trigger_match:
-            # Get text after trigger
-            after_trigger = text[trigger_match.end():]
-            after_trigger_lower = after_trigger.lower()
-            
-            # Find time indicator
-            for time_pattern in time_patterns:
-                time_match = re.search(time_pattern, after_trigger_lower)
-                if time_match:
-                    # Task is between trigger and time indicator
-                    task = after_trigger[:time_match.start()].strip()
-                    # Time is from time indicator onwards
-                    time_str = after_trigger[time_match.start():].strip()
-                    return task, time_str
-    
-    # Fallback: Try to split by common time indicators without trigger phrases
-    for time_pattern in time_patterns:
-        time_match = re.search(time_pattern, text_lower)
+    trigger_match = TRIGGER_PATTERN.search(text_lower)
+    if trigger_match:
+        # Find time indicator after the trigger, searching in place
+        time_match = TIME_PATTERN.search(text_lower, trigger_match.end())
         if time_match:
-            task = text[:time_match.start()].strip()
+            # Task is between trigger and time indicator
+            task = text[trigger_match.end():time_match.start()].strip()
+            # Time is from time indicator onwards
             time_str = text[time_match.start():].strip()
-            if task:  # Make sure we have a task
-                return task, time_str
+            return task, time_str
+    
+    # Fallback: Try to split by common time indicators without trigger phrases
+    time_match = TIME_PATTERN.search(text_lower)
+    if time_match:
+        task = text[:time_match.start()].strip()
+        time_str = text[time_match.start():].strip()
+        if task:  # Make sure we have a task
+            return task, time_str
     
     return None, None
 
@@ -239,51 +420,28 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     task, time_str = extract_task_and_time(text)
     
     if not task or not time_str:
-        await update.message.reply_text(
-            "❌ I couldn't understand that.\n\n"
-            "Try something like:\n"
-            "• Remind me to call mom at 5pm\n"
-            "• Send me a hey in 2 minutes\n"
-            "• Tell me to workout at 6am tomorrow\n\n"
-            "_Created by Achu Vijayakumar_ ✨",
-            parse_mode='Markdown'
-        )
+        await update.message.reply_text(ERR_NO_PARSE, parse_mode='Markdown')
         return
     
     current_time = datetime.now()
     remind_time = parse_time(time_str, current_time)
     
     if not remind_time:
-        await update.message.reply_text(
-            "❌ I couldn't understand that time format.\n\n"
-            "Try formats like:\n"
-            "• at 5:30pm\n"
-            "• in 30 minutes\n"
-            "• at 14:00 tomorrow\n"
-            "• after 2 hours\n\n"
-            "_Created by Achu Vijayakumar_ ✨",
-            parse_mode='Markdown'
-        )
+        await update.message.reply_text(ERR_NO_TIME, parse_mode='Markdown')
         return
     
     if remind_time <= current_time:
-        await update.message.reply_text(
-            "❌ That time is in the past!\n\n"
-            "_Created by Achu Vijayakumar_ ✨",
-            parse_mode='Markdown'
-        )
+        await update.message.reply_text(ERR_PAST, parse_mode='Markdown')
         return
     
-    # Add reminder
-    bot_instance.add_reminder(chat_id, task, remind_time)
+    # Add and schedule the reminder
+    reminder_id = bot_instance.add_reminder(chat_id, task, remind_time)
+    schedule_reminder(reminder_id, remind_time)
     
-    # Schedule the reminder
-    delay = (remind_time - current_time).total_seconds()
-    context.job_queue.run_once(send_reminder, delay, data={'chat_id': chat_id, 'message': task})
-    
-    time_until = remind_time - current_time
-    hours = int(time_until.total_seconds() // 3600)
-    minutes = int((time_until.total_seconds() % 3600) // 60)
+    seconds_until = (remind_time - current_time).total_seconds()
+    hours = int(seconds_until // 3600)
+    minutes = int((seconds_until % 3600) // 60)
+    when = remind_time.strftime('%I:%M %p, %b %d, %Y')
     
     time_msg = ""
     if hours > 0:
@@ -292,23 +450,42 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         time_msg += f"{minutes} minute{'s' if minutes > 1 else ''}"
     
     await update.message.reply_text(
-        f"✅ *Got it!*\n\n"
-        f"📝 I'll remind you: {task}\n"
-        f"⏰ At: {remind_time.strftime('%I:%M %p, %b %d, %Y')}\n"
-        f"⏳ In: {time_msg.strip()}\n\n"
-        f"_Created by Achu Vijayakumar_ ✨",
+        ACK_TEMPLATE.format(task=task, when=when, delta=time_msg.strip()),
         parse_mode='Markdown'
     )
 
-async def send_reminder(context: ContextTypes.DEFAULT_TYPE):
+def schedule_reminder(reminder_id, remind_time):
+    """Queue a reminder for the scheduler loop"""
+    heapq.heappush(reminder_heap, (remind_time.timestamp(), reminder_id))
+    heap_changed.set()
+
+async def scheduler_loop(application):
+    """Sleep until the earliest reminder is due, send it, repeat"""
+    while True:
+        timeout = None
+        if reminder_heap:
+            timeout = reminder_heap[0][0] - time.time()
+            if timeout <= 0:
+                _, reminder_id = heapq.heappop(reminder_heap)
+                # Reminders deleted since they were queued are skipped
+                reminder = bot_instance.get_reminder(reminder_id)
+                if reminder:
+                    application.create_task(
+                        send_reminder(application.bot, reminder['chat_id'], reminder['message'])
+                    )
+                continue
+        
+        heap_changed.clear()
+        try:
+            await asyncio.wait_for(heap_changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+async def send_reminder(bot, chat_id, message):
     """Send the reminder message"""
-    job_data = context.job.data
-    chat_id = job_data['chat_id']
-    message = job_data['message']
-    
-    await context.bot.send_message(
+    await bot.send_message(
         chat_id=chat_id,
-        text=f"🔔 *PING!*\n\n{message}\n\n_Created by Achu Vijayakumar_ ✨",
+        text=PING_TEMPLATE.format(message=message),
         parse_mode='Markdown'
     )
 
@@ -318,40 +495,56 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
     
     if query.data.startswith("delete_"):
+        # Buttons sent by the JSON version carry "{chat_id}_{timestamp}" ids, which match nothing
         reminder_id = query.data.replace("delete_", "")
-        if bot_instance.delete_reminder(reminder_id):
-            await query.edit_message_text(
-                "✅ Reminder deleted successfully!\n\n_Created by Achu Vijayakumar_ ✨",
-                parse_mode='Markdown'
-            )
+        if reminder_id.isdigit() and bot_instance.delete_reminder(int(reminder_id)):
+            await query.edit_message_text(DELETED_TEXT, parse_mode='Markdown')
         else:
-            await query.edit_message_text(
-                "❌ Reminder not found!\n\n_Created by Achu Vijayakumar_ ✨",
-                parse_mode='Markdown'
-            )
+            await query.edit_message_text(NOT_FOUND_TEXT, parse_mode='Markdown')
+    
+    elif query.data.startswith("list_page_"):
+        chat_id = update.effective_chat.id
+        page = int(query.data.replace("list_page_", ""))
+        # Reminders may have fired or been deleted since; fall back to the first page
+        listing = build_reminder_page(chat_id, page) or build_reminder_page(chat_id, 0)
+        if not listing:
+            await query.edit_message_text(NO_REMINDERS_TEXT, parse_mode='Markdown')
+            return
+        message, reply_markup = listing
+        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
 
 async def reschedule_reminders(application):
     """Reschedule all pending reminders on bot restart"""
     current_time = datetime.now()
     
-    for reminder_id, reminder in list(bot_instance.reminders.items()):
-        remind_time = datetime.fromisoformat(reminder['time'])
+    for reminder_id, reminder in bot_instance.get_all_reminders().items():
+        remind_time = reminder['time']
         
         if remind_time > current_time:
-            delay = (remind_time - current_time).total_seconds()
-            application.job_queue.run_once(
-                send_reminder,
-                delay,
-                data={'chat_id': reminder['chat_id'], 'message': reminder['message']}
-            )
+            reminder_heap.append((remind_time.timestamp(), reminder_id))
         else:
             # Delete expired reminders
             bot_instance.delete_reminder(reminder_id)
+    
+    heapq.heapify(reminder_heap)
+    application.bot_data['scheduler'] = asyncio.create_task(scheduler_loop(application))
+
+async def stop_scheduler(application):
+    """Cancel the scheduler loop and commit pending writes on shutdown"""
+    scheduler = application.bot_data.pop('scheduler', None)
+    if scheduler:
+        scheduler.cancel()
+    bot_instance.flush()
 
 def main():
     """Start the bot"""
-    # Replace with your actual bot token
-    TOKEN = "8435749626:AAFdsDqtjmvvqfF6jOdXpGEc8UO2lsrf39U"
+    # Get token from environment variable for security
+    TOKEN = os.getenv("BOT_TOKEN")
+    
+    if not TOKEN:
+        print("❌ ERROR: BOT_TOKEN environment variable not found!")
+        print("Please set BOT_TOKEN in your environment variables.")
+        return
     
     # Create the Application
     application = Application.builder().token(TOKEN).build()
@@ -365,6 +558,7 @@ def main():
     
     # Reschedule reminders after startup
     application.post_init = reschedule_reminders
+    application.post_shutdown = stop_scheduler
     
     # Run the bot
     print("🤖 MemoryPing is running... Created by Achu Vijayakumar")
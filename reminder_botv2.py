@@ -1140,7 +1140,13 @@ async def reschedule_reminders(application):
 
 def main():
     """Start the bot"""
-    TOKEN = "8435749626:AAFdsDqtjmvvqfF6jOdXpGEc8UO2lsrf39U"
+    # Get token from environment variable for security
+    TOKEN = os.getenv("BOT_TOKEN")
+    
+    if not TOKEN:
+        print("❌ ERROR: BOT_TOKEN environment variable not found!")
+        print("Please set BOT_TOKEN in your environment variables.")
+        return
     
     # Create the Application with JobQueue
     application = (